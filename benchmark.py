@@ -0,0 +1,283 @@
+# benchmark.py
+# Meet hoe de planners uit kortsteRoute.py schalen met de grootte van het bord, het aantal groene schijfjes en het
+# aantal rode schijfjes. Gebruik:
+#   python benchmark.py                                  # alle borden, resultaten naar benchmark_results.json
+#   python benchmark.py --quick --save-baseline base.json
+#   python benchmark.py --quick --baseline base.json     # exit code 1 bij een regressie of een slechtere kost
+
+import argparse
+import io
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import kortsteRoute
+
+try:
+    import numpy # optioneel, enkel voor de backend "heldkarp-numpy"
+except ImportError:
+    numpy = None
+
+SIZES = [(4, 6), (8, 8), (12, 12)]
+GREENS = [4, 7, 10]
+DENSITIES = [0.0, 0.15]
+SEEDS = [0, 1]
+
+QUICK_SIZES = [(4, 6), (8, 8)]
+QUICK_GREENS = [4, 7]
+QUICK_SEEDS = [0]
+
+MAX_PERMUTATION_GREENS = 7  # meer groene schijfjes duurt met "permutations" te lang
+EPSILON = 1e-9
+
+# Elke backend is een functie (board, start, finish, stats) -> (kost, route). 'exact' geeft aan of de backend het
+# optimum moet vinden: zo'n backend mag nooit een hogere kost geven dan de referentie van hetzelfde kostmodel.
+# De tour-solvers zijn optimaal voor de segmenttabel (referentie "heldkarp"), 'collectExact' is optimaal over
+# alle routes (referentie "exact") en is bovendien een ondergrens voor elke backend. "heldkarp-numpy" kiest tussen
+# even snelle deelroutes zoals de Python-versie (zie 'segmentTableNumpy') en moet dus exact dezelfde kost geven.
+# De backends plannen zonder ROUTE_CACHE: gemeten wordt de planner zelf op het bord zoals het gegeven is.
+
+def tour_help(method, **options):
+    def run(board, start, finish, stats):
+        return kortsteRoute.planRoute(board, start, finish, method, stats=stats, cache=False, **options)
+    return run
+
+def fastest_help(board, start, finish, stats):
+    """
+        snelste route van de start naar de verste hoek, zonder groene schijfjes (meet 'fastestRoute' en
+        'calculateTime').
+    """
+
+    corner = (0 if start[0] >= board.rows / 2 else board.rows - 1, 0 if start[1] >= board.cols / 2 else board.cols - 1)
+    route = kortsteRoute.fastestRoute(board, start, corner, stats)
+    if route is None:
+        return math.inf, None
+    return (kortsteRoute.calculateTime(route) if len(route) > 1 else 0.0), route
+
+BACKENDS = {
+    # naam: (functie, exact, referentie)
+    "permutations": (tour_help("permutations"), True, "heldkarp"),
+    "heldkarp": (tour_help("heldkarp"), True, "heldkarp"),
+    "branchbound": (tour_help("branchbound"), True, "heldkarp"),
+    "heuristic": (tour_help("heuristic", time_budget=0.05), False, "heldkarp"),
+    "parallel": (tour_help("parallel"), True, "heldkarp"),
+    "heldkarp-numpy": (tour_help("heldkarp", backend="numpy"), True, "heldkarp"),
+    "exact": (tour_help("exact"), True, "exact"),
+    "fastest": (fastest_help, False, None),
+}
+DEFAULT_BACKENDS = ["permutations", "heldkarp", "branchbound", "heuristic", "exact", "fastest"]
+if numpy is not None:
+    DEFAULT_BACKENDS.append("heldkarp-numpy")
+
+def makeBoard(rows, cols, greens, density, seed):
+    """
+        De functie maakt een willekeurig (maar met 'seed' herhaalbaar) bord en geeft (board, start, finish) terug.
+        De start (en finish) is altijd (0, 0) en is nooit rood.
+    """
+
+    rng = random.Random(f"{rows}x{cols}-{greens}-{density}-{seed}")
+    cells = [(x, y) for x in range(rows) for y in range(cols) if (x, y) != (0, 0)]
+    rng.shuffle(cells)
+    reds = int(density * rows * cols)
+    board = kortsteRoute.initiate_board(rows, cols)
+    for x, y in cells[:reds]:
+        kortsteRoute.putRed(board, x, y)
+    for x, y in cells[reds:reds + greens]:
+        kortsteRoute.putGreen(board, x, y)
+    return board, (0, 0), (0, 0)
+
+def cases(quick=False):
+    """
+        De functie geeft alle benchmarkgevallen terug als tupels (naam, rijen, kolommen, groen, dichtheid, seed).
+    """
+
+    sizes, greens, seeds = (QUICK_SIZES, QUICK_GREENS, QUICK_SEEDS) if quick else (SIZES, GREENS, SEEDS)
+    return [(f"{rows}x{cols}-g{count}-r{density}-s{seed}", rows, cols, count, density, seed)
+            for rows, cols in sizes for count in greens for density in DENSITIES for seed in seeds]
+
+def measure(function, board, start, finish, repeat):
+    """
+        De functie voert een backend 'repeat' keer uit met lege caches en geeft (kost, beste tijd, piekgeheugen,
+        stats) terug. Het geheugen wordt in een aparte run gemeten omdat tracemalloc alles trager maakt.
+    """
+
+    best = math.inf
+    for _ in range(repeat):
+        kortsteRoute.SEGMENT_CACHE.clear()
+        kortsteRoute.SEGMENT_REUSE.clear()
+        kortsteRoute.PATH_CACHE.clear()
+        kortsteRoute.ROUTE_CACHE.clear()
+        stats = {}
+        started = time.perf_counter()
+        cost, route = function(board, start, finish, stats)
+        best = min(best, time.perf_counter() - started)
+
+    kortsteRoute.SEGMENT_CACHE.clear()
+    kortsteRoute.SEGMENT_REUSE.clear()
+    kortsteRoute.PATH_CACHE.clear()
+    kortsteRoute.ROUTE_CACHE.clear()
+    tracemalloc.start()
+    function(board, start, finish, {})
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return (cost if route is not None else math.inf), best, peak, stats, route
+
+def measureCompile(route, board, repeat):
+    """
+        De functie meet hoe lang het duurt om een route om te zetten naar instructions.txt en website.json (in het
+        geheugen) en geeft (beste tijd, grootte) terug, met de grootte een dictionary zoals bij 'makeRouteFiles'.
+    """
+
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        sizes = kortsteRoute.makeRouteFiles(route, board, 1, io.StringIO(), io.StringIO())
+        best = min(best, time.perf_counter() - started)
+    return best, sizes
+
+def runBenchmarks(backends, quick=False, repeat=3, log=None):
+    """
+        De functie voert alle backends uit op alle benchmarkgevallen en geeft een lijst van resultaten terug
+        (een dictionary per geval en backend). Een kost van None betekent dat er geen route bestaat.
+    """
+
+    results = []
+    for name, rows, cols, greens, density, seed in cases(quick):
+        board, start, finish = makeBoard(rows, cols, greens, density, seed)
+        for backend in backends:
+            function = BACKENDS[backend][0]
+            if backend == "permutations" and greens > MAX_PERMUTATION_GREENS:
+                continue
+            cost, seconds, peak, stats, route = measure(function, board, start, finish, repeat)
+            result = {
+                "case": name,
+                "backend": backend,
+                "seconds": seconds,
+                "peak_kib": peak / 1024,
+                "nodes": stats.get("nodes"),
+                "expanded": stats.get("expanded"),
+                "evaluated": stats.get("evaluated"),
+                "phases": stats.get("phases", {}),
+                "compile_seconds": None,
+                "pico_size": None,
+                "website_size": None,
+                "cost": None if math.isinf(cost) else cost,
+            }
+            if route is not None and len(route) > 1:
+                result["compile_seconds"], sizes = measureCompile(route, board, repeat)
+                result["pico_size"] = sizes["pico_size"]
+                result["website_size"] = sizes["website_size"]
+            results.append(result)
+            if log is not None:
+                print(f"{name:24} {backend:15} {seconds * 1000:9.2f} ms {result['peak_kib']:9.1f} KiB  kost {result['cost']}",
+                      file=log)
+    return results
+
+def checkResults(results, baseline=None, tolerance=1.5, slack=0.005):
+    """
+        De functie geeft een lijst van foutmeldingen terug:
+        - een exacte backend met een hogere kost dan de referentie van zijn kostmodel;
+        - een backend met een lagere kost dan 'collectExact' (dat kan niet, dus een fout in de planner);
+        - (met een baseline) een kost die veranderd is, of een tijd, compileertijd of piekgeheugen groter dan
+          'tolerance' keer de baseline plus 'slack' (seconden, of 'slack' * 1000 KiB voor het geheugen).
+    """
+
+    costs = {(r["case"], r["backend"]): r["cost"] for r in results}
+    failures = []
+
+    for r in results:
+        key = (r["case"], r["backend"])
+        _, exact, reference = BACKENDS[r["backend"]]
+        cost = math.inf if r["cost"] is None else r["cost"]
+
+        if exact and (r["case"], reference) in costs:
+            expected = costs[(r["case"], reference)]
+            expected = math.inf if expected is None else expected
+            if cost > expected + EPSILON:
+                failures.append(f"{key}: kost {cost} is slechter dan de referentie {reference} ({expected})")
+        if reference is not None and (r["case"], "exact") in costs:
+            bound = costs[(r["case"], "exact")]
+            if bound is not None and cost < bound - EPSILON:
+                failures.append(f"{key}: kost {cost} is lager dan het exacte optimum ({bound})")
+
+    if baseline is not None:
+        old = {(r["case"], r["backend"]): r for r in baseline["results"]}
+        for r in results:
+            key = (r["case"], r["backend"])
+            if key not in old:
+                continue
+            before = old[key]
+            if BACKENDS[r["backend"]][1] and before["cost"] != r["cost"] and (
+                    before["cost"] is None or r["cost"] is None or abs(before["cost"] - r["cost"]) > EPSILON):
+                failures.append(f"{key}: kost {r['cost']} verschilt van de baseline ({before['cost']})")
+            if r["seconds"] > tolerance * before["seconds"] + slack:
+                failures.append(f"{key}: {r['seconds'] * 1000:.2f} ms, baseline {before['seconds'] * 1000:.2f} ms")
+            if (r.get("compile_seconds") is not None and before.get("compile_seconds") is not None
+                    and r["compile_seconds"] > tolerance * before["compile_seconds"] + slack):
+                failures.append(f"{key}: compileren {r['compile_seconds'] * 1000:.2f} ms, "
+                                f"baseline {before['compile_seconds'] * 1000:.2f} ms")
+            if r["peak_kib"] > tolerance * before["peak_kib"] + slack * 1000:
+                failures.append(f"{key}: {r['peak_kib']:.1f} KiB, baseline {before['peak_kib']:.1f} KiB")
+
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark van de planners uit kortsteRoute.py")
+    parser.add_argument("--quick", action="store_true", help="enkel de kleine borden")
+    parser.add_argument("--backends", default=",".join(DEFAULT_BACKENDS),
+                        help=f"komma-gescheiden, kies uit {sorted(BACKENDS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="aantal metingen per geval (de snelste telt)")
+    parser.add_argument("--output", default="benchmark_results.json", help="resultaten als JSON ('-' = stdout)")
+    parser.add_argument("--baseline", help="vergelijk met een eerder bewaarde baseline")
+    parser.add_argument("--save-baseline", help="bewaar de resultaten ook als baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="toegelaten factor t.o.v. de baseline")
+    args = parser.parse_args(argv)
+
+    backends = [b for b in args.backends.split(",") if b]
+    for backend in backends:
+        if backend not in BACKENDS:
+            parser.error(f"onbekende backend '{backend}', kies uit {sorted(BACKENDS)}")
+    if "heldkarp-numpy" in backends and numpy is None:
+        parser.error("NumPy is niet geinstalleerd, laat 'heldkarp-numpy' weg")
+    # de referenties moeten altijd mee gemeten worden
+    for backend in list(backends):
+        reference = BACKENDS[backend][2]
+        if reference is not None and reference not in backends:
+            backends.append(reference)
+
+    kortsteRoute.closeDiskCache() # ook met KORTSTEROUTE_CACHE elke keer echt plannen
+    results = runBenchmarks(backends, args.quick, args.repeat, log=sys.stderr)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": numpy is not None,
+        "constants": [kortsteRoute.TIMESTRAIGHT, kortsteRoute.TIMETURN, kortsteRoute.TIMEPICKUP],
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=1)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = checkResults(results, baseline, args.tolerance)
+    for failure in failures:
+        print("!!! Error !!!:", failure, file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
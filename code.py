@@ -2,6 +2,8 @@
 
 import time
 import os
+import io
+import json
 import math
 import board
 import pwmio
@@ -13,6 +15,11 @@ import wifi
 from adafruit_motor import servo
 from adafruit_httpserver import Server, Request, Response, GET, Websocket
 
+try:
+    import planner # optioneel, om een bord dat over de websocket binnenkomt op het wagentje zelf te plannen
+except ImportError:
+    planner = None
+
 # ======== HARDWARE CONFIGURATION ========
 # --- Pin Definitions ---
 # RGB LED Pins
@@ -159,17 +166,76 @@ laatste_afstand = None          # laatste gemeten afstand
 
 # --- Navigation State ---
 # Route
-try:
-    with open("instructions.txt", "r") as file:
-        content = file.read().strip()
-        instructions_list = content.split("\n")
-except FileNotFoundError:
-    instructions_list = [] 
-
-route = instructions_list  # F = forward, L = left, R = right, T180 = turn 180, P = pickup, S = stop
-print("Route:", route)
+class RouteReader:
+    # Leest instructions.txt instructie per instructie in plaats van het hele bestand als lijst in het geheugen.
+    # Werkt met het gewone formaat (een instructie per regel) en met het compacte formaat, waarin "F3" staat
+    # voor drie keer "F" na elkaar. 'pickups' is het aantal "P"'s dat nog niet gelezen is.
+    # 'bron' is een bestandsnaam of een open stream (bv. de io.StringIO van de planner).
+    def __init__(self, bron):
+        self.file = None
+        self.herhaal = 0   # aantal "F"'s van een "F<aantal>" die nog moeten komen
+        self.lengte = 0    # aantal instructies (uitgepakt)
+        self.totaal_pickups = 0
+        if isinstance(bron, str):
+            try:
+                self.file = open(bron, "r")
+            except OSError:
+                pass
+        else:
+            self.file = bron
+        # een keer door het bestand om te tellen, zonder het bij te houden
+        while True:
+            command = self.lees_regel()
+            if command is None:
+                break
+            self.lengte += self.herhaal + 1
+            if command == "P":
+                self.totaal_pickups += 1
+        self.reset()
+
+    def lees_regel(self):
+        # volgende niet-lege regel, een "F<aantal>" wordt "F" met herhaal = aantal - 1
+        self.herhaal = 0
+        if self.file is None:
+            return None
+        while True:
+            line = self.file.readline()
+            if not line:
+                return None
+            command = line.strip()
+            if not command:
+                continue
+            if command[0] == "F" and len(command) > 1:
+                self.herhaal = int(command[1:]) - 1
+                return "F"
+            return command
+
+    def reset(self):
+        self.herhaal = 0
+        self.pickups = self.totaal_pickups
+        if self.file is not None:
+            self.file.seek(0)
+
+    def next(self):
+        # volgende instructie, of None aan het einde van de route
+        if self.herhaal > 0:
+            self.herhaal -= 1
+            return "F"
+        command = self.lees_regel()
+        if command == "P":
+            self.pickups -= 1
+        return command
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+route = RouteReader("instructions.txt")  # F = forward, L = left, R = right, T180 = turn 180, P = pickup, S = stop, W2.4 = wacht 2.4 s
+print(f"Route: {route.lengte} instructies, {route.totaal_pickups} pickups")
 route_index = 0
 command = ""
+PLANNER_CAP = 48 * 1024  # maximaal geheugengebruik (bytes) van de planner op het wagentje
 
 # Crosspoint detection
 kruispunt_teller = 0
@@ -199,6 +265,10 @@ turn_180_lijn_confirmaties = 0
 pickup_status = "idle"        # idle, lift
 pickup_starttijd = 0
 
+# Wait (bij meerdere wagentjes, instructie "W<seconden>")
+wacht_status = "idle"         # idle, wacht
+wacht_eindtijd = 0
+
 # Reverse
 achteruit_bezig = False
 achteruit_starttijd = 0
@@ -509,6 +579,29 @@ def update_pickup():
         is_manoeuvre_active = False
         print("Regular pickup completed")
 
+def start_wachten(seconden):
+    global wacht_status, wacht_eindtijd, is_manoeuvre_active
+
+    print(f"Wachten: {seconden} s")
+    stop()
+    # blokkeert de kruispuntdetectie zoals de pickup
+    is_manoeuvre_active = True
+    wacht_status = "wacht"
+    wacht_eindtijd = time.monotonic() + seconden
+
+
+def update_wachten():
+    global wacht_status, rijden, is_manoeuvre_active
+
+    if wacht_status != "idle":
+        is_manoeuvre_active = True
+
+    if wacht_status == "wacht" and time.monotonic() >= wacht_eindtijd:
+        wacht_status = "idle"
+        rijden = True
+        is_manoeuvre_active = False
+        print("Wachten voltooid")
+
 # -------- Calibration Functions --------
 def kalibratie_draai_rechts():
     set_motoren_richting(True,True)
@@ -657,6 +750,9 @@ def cleanup_resources():
         rechterbocht_status = "idle"
         linkerbocht_status = "idle"
         
+        # Sluit het routebestand
+        route.close()
+
         # Sluit de WebSocket
         if websocket is not None:
             try:
@@ -673,10 +769,40 @@ def cleanup_resources():
     except Exception as e:
         print(f" Error during cleanup: {e}")
 
+# -------- Route Planning --------
+def plan_bord(tekst):
+    # plant een bord (JSON zoals bij boardFromJson in kortsteRoute.py) op het wagentje zelf en vervangt de route
+    global route, route_index, command, rijden, naar_garage
+
+    if planner is None:
+        send_websocket_message("plan_error:planner.py ontbreekt")
+        return
+
+    stop()
+    rijden = False
+    try:
+        data = json.loads(tekst)
+        stream = io.StringIO()
+        stats = planner.planBoard(data, stream, data.get("start_direction", 1), PLANNER_CAP)
+    except (ValueError, KeyError, TypeError, IndexError, MemoryError) as e:
+        print(f" Error tijdens het plannen: {e}")
+        send_websocket_message(f"plan_error:{e}")
+        return
+
+    route.close()
+    stream.seek(0)
+    route = RouteReader(stream)
+    route_index = 0
+    command = ""
+    naar_garage = False
+    print(f"Nieuwe route: {route.lengte} instructies in {stats['total_ms']:.0f} ms")
+    send_websocket_message("plan:" + json.dumps(stats))
+
 # -------- WebSocket Command Handler --------
 def handle_websocket_command(data):
     global rijden, gestart, manueel, route, route_index, command
     global achteruit_bezig, pickup_status, is_manoeuvre_active, turn_180_status, rechterbocht_status, linkerbocht_status
+    global wacht_status
 
     print(f"received: {data}")
     send_websocket_message(data)  # de command terugsturen (voor debug en log)
@@ -700,6 +826,7 @@ def handle_websocket_command(data):
         is_manoeuvre_active = False
         achteruit_bezig = False
         pickup_status = "idle"
+        wacht_status = "idle"
         turn_180_status = "idle"
         rechterbocht_status = "idle" 
         linkerbocht_status = "idle"
@@ -723,11 +850,14 @@ def handle_websocket_command(data):
         kalibratie()
     
     elif data == "resetroute":
-        route = instructions_list
+        route.reset()
         route_index = 0
         command = ""
         print("route gereset!")
 
+    elif data.startswith("board:"):
+        plan_bord(data[len("board:"):])
+
 # Manual mode commands
     elif manueel:
         if data == "forward":
@@ -797,6 +927,7 @@ try:
             update_rechterbocht()
             update_turn_180()
             update_pickup()
+            update_wachten()
             update_meet_afstand()
 
             is_manoeuvre_active = (
@@ -804,7 +935,8 @@ try:
                 rechterbocht_status != "idle" or
                 linkerbocht_status != "idle" or
                 turn_180_status != "idle" or
-                                pickup_status != "idle"
+                                pickup_status != "idle" or
+                wacht_status != "idle"
             )
 
 
@@ -824,25 +956,28 @@ try:
                             continue
 
                     # --- Kruispunt Detectie & Route Navigatie ---
-                    is_kruispunt_conditie = achter_op_lijn or command == "P" or bocht_voltooid
+                    # na een pickup of het wachten volgt de volgende instructie meteen, op hetzelfde kruispunt
+                    na_stilstand = command == "P" or command.startswith("W")
+                    is_kruispunt_conditie = achter_op_lijn or na_stilstand or bocht_voltooid
                     print(f"is_kruispunt_conditie:{is_kruispunt_conditie}, achter_op_lijn:{achter_op_lijn}, is command = P?:{command}, bocht voltooid:{bocht_voltooid}. !!!")
 
                     if is_kruispunt_conditie:
                         bocht_voltooid = False
-                        if (current_time - laatste_kruispunt_tijd > 1) or command == "P":
+                        if (current_time - laatste_kruispunt_tijd > 1) or na_stilstand:
                             stop()
                             laatste_kruispunt_tijd = current_time
                             print(f"Kruispunt! Index: {route_index}")
 
 
-                            if route_index < len(route):
-                                command = route[route_index]
+                            next_command = route.next()
+                            if next_command is not None:
+                                command = next_command
                                 send_websocket_message(f"route_index:{route_index}:{command}")
                                 print(f"  Uitvoeren: '{command}'")
                                 rijden = False
                                 time.sleep(0.1)
                                 
-                                if not naar_garage and "P" not in route[route_index:]:
+                                if not naar_garage and command != "P" and route.pickups == 0:
                                     update_led_state("garage")
                                     naar_garage = True
 
@@ -863,6 +998,8 @@ try:
                                 elif command == "P":
                                     print(f"P command detected at index {route_index}")
                                     start_pickup()
+                                elif command.startswith("W"):
+                                    start_wachten(float(command[1:]))
                                 else:
                                     print(f"  Onbekend commando: {command}")
                                     rijden = True
@@ -1,26 +1,243 @@
 # KortsteRouteTeam209.py  
 # Soms ChatGPT gebruikt voor helpen met debuggen of voor vragen zoals "Hoe pas ik makkelijk een functie toe op elke waarde in een lijst?", dus vergelijkbaar met het gebruik van Stack Overflow of documentatie.
 
-import turtle
 import time
 import json
+import heapq
+import math
+import array
+import itertools
+import random
+import os
+import multiprocessing
+import concurrent.futures
+import collections
+import hashlib
+import argparse
+import sys
+import threading
+import queue
+import atexit
+
+try:
+    import sqlite3 # optioneel, enkel nodig voor openDiskCache
+except ImportError:
+    sqlite3 = None
 
 TIMESTRAIGHT = 2.4    # tijd nodig om 1 vak vooruit te rijden
 TIMETURN = 3.0       # tijd nodig om binnen 1 vak een 90 graden te draaien
 TIMEPICKUP = 1.0    # tijd nodig om 1 groen torentje op te pakken
 
+RICHTINGEN = [(-1, 0), (0, 1), (1, 0), (0, -1)] # 0 = up, 1 = right, 2 = down, 3 = left
+
 ACCEPT = 'accept'
 ABANDON = 'abandon'
 CONTINUE = 'continue'
 
 # INITIALISATIE
 
+class Board:
+    """
+        Compact speelbord: de vakjes zitten in een platte bytearray (vak (x, y) heeft index x * cols + y) met een
+        " ", "G" of "R" per vak. De posities van de groene en rode schijfjes worden bijgehouden bij elke wijziging,
+        en 'moves' bevat per vak de toegestane stappen als tupels (richting, index van het buurvak), zodat de
+        zoekalgoritmes niet bij elke stap de randen en rode schijfjes moeten controleren.
+
+        Voor bestaande code gedraagt het bord zich als een lijst van rijen: board[x][y], len(board), len(board[0])
+        en 'for row in board' werken zoals bij de oude lijst van lijsten.
+    """
+
+    __slots__ = ("rows", "cols", "cells", "greens", "reds", "moves", "red_fingerprint", "red_set", "corridors")
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.cells = bytearray(b" " * (rows * cols))
+        self.greens = set()
+        self.reds = set()
+        self.moves = [self.legalMoves(i) for i in range(rows * cols)]
+        self.red_fingerprint = None
+        self.red_set = None
+        self.corridors = {}
+
+    def fingerprint(self):
+        """
+            Korte hash (16 bytes) van de afmetingen en de posities van de rode schijfjes. Enkel de rode schijfjes
+            bepalen de deelroutes, dus borden die enkel in groene schijfjes verschillen hebben dezelfde fingerprint.
+            De hash wordt bewaard tot er een rood schijfje bijkomt of verdwijnt.
+        """
+
+        if self.red_fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{self.rows}x{self.cols}:".encode())
+            digest.update(self.cells.translate(RED_MASK))
+            self.red_fingerprint = digest.digest()
+        return self.red_fingerprint
+
+    def redSet(self):
+        """
+            De posities van de rode schijfjes als frozenset, bewaard tot er een rood schijfje bijkomt of verdwijnt.
+        """
+
+        if self.red_set is None:
+            self.red_set = frozenset(self.reds)
+        return self.red_set
+
+    def index(self, pos):
+        return pos[0] * self.cols + pos[1]
+
+    def position(self, i):
+        return divmod(i, self.cols)
+
+    def legalMoves(self, i):
+        """
+            Geeft de toegestane stappen vanuit vak i terug als tupel van (richting, index van het buurvak).
+        """
+
+        x, y = divmod(i, self.cols)
+        output = []
+        for direction, (dx, dy) in enumerate(RICHTINGEN):
+            new_x = x + dx
+            new_y = y + dy
+            if 0 <= new_x < self.rows and 0 <= new_y < self.cols and self.cells[new_x * self.cols + new_y] != 82: # "R"
+                output.append((direction, new_x * self.cols + new_y))
+        return tuple(output)
+
+    def corridorMoves(self, i):
+        """
+            Geeft de stappen vanuit vak i terug als tupel van (richting, index van het eindvak, aantal stappen,
+            doodlopend). Een rechte gang (vakken waar enkel rechtdoor of terug kan) wordt in een stap doorlopen tot
+            het eerste vak waar gedraaid kan worden. 'doodlopend' is True als de gang eindigt tegen een muur of rood
+            schijfje. De stappen worden per vak bewaard tot er een rood schijfje bijkomt of verdwijnt.
+        """
+
+        output = self.corridors.get(i)
+        if output is not None:
+            return output
+
+        moves = self.moves
+        output = []
+        for direction, j in moves[i]:
+            steps = 1
+            while True:
+                ahead = moves[j]
+                if len(ahead) != 2 or (ahead[0][0] - ahead[1][0]) % 2:
+                    break # geen gang: kruispunt, bocht of doodlopend vak
+                j = ahead[0][1] if ahead[0][0] == direction else ahead[1][1]
+                steps += 1
+            output.append((direction, j, steps, len(moves[j]) == 1))
+        output = tuple(output)
+        self.corridors[i] = output
+        return output
+
+    def get(self, x, y):
+        return chr(self.cells[x * self.cols + y])
+
+    def set(self, x, y, value):
+        """
+            Zet vak (x, y) op " ", "G" of "R" en werkt de groene en rode posities en de stappen van de buren bij.
+        """
+
+        i = x * self.cols + y
+        old = chr(self.cells[i])
+        if old == value:
+            return
+        self.cells[i] = ord(value)
+        self.greens.discard((x, y))
+        self.reds.discard((x, y))
+        if value == "G":
+            self.greens.add((x, y))
+        elif value == "R":
+            self.reds.add((x, y))
+        if old == "R" or value == "R":
+            self.red_fingerprint = None
+            self.red_set = None
+            self.corridors = {}
+            for dx, dy in RICHTINGEN:
+                if 0 <= x + dx < self.rows and 0 <= y + dy < self.cols:
+                    j = (x + dx) * self.cols + y + dy
+                    self.moves[j] = self.legalMoves(j)
+
+    def copy(self):
+        other = Board(self.rows, self.cols)
+        other.cells[:] = self.cells
+        other.greens = set(self.greens)
+        other.reds = set(self.reds)
+        other.moves = list(self.moves)
+        other.red_fingerprint = self.red_fingerprint
+        other.red_set = self.red_set
+        other.corridors = self.corridors
+        return other
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self.rows
+        if not 0 <= x < self.rows:
+            raise IndexError("board index out of range")
+        return BoardRow(self, x)
+
+    def __iter__(self):
+        for x in range(self.rows):
+            yield BoardRow(self, x)
+
+    def __repr__(self):
+        return repr([list(row) for row in self])
+
+class BoardRow:
+    """
+        Weergave van een rij van een 'Board' als lijst, voor code die board[x][y] gebruikt.
+    """
+
+    __slots__ = ("board", "x")
+
+    def __init__(self, board, x):
+        self.board = board
+        self.x = x
+
+    def __len__(self):
+        return self.board.cols
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.board.cols
+        if not 0 <= y < self.board.cols:
+            raise IndexError("board index out of range")
+        return self.board.get(self.x, y)
+
+    def __setitem__(self, y, value):
+        self.board.set(self.x, y, value)
+
+    def __iter__(self):
+        start = self.x * self.board.cols
+        return iter(self.board.cells[start:start + self.board.cols].decode())
+
+    def __repr__(self):
+        return repr(list(self))
+
+def asBoard(board):
+    """
+        De functie geeft 'board' terug als 'Board'. Een bord als lijst van lijsten (oude voorstelling) wordt omgezet.
+    """
+
+    if isinstance(board, Board):
+        return board
+
+    output = Board(len(board), len(board[0]))
+    for i in range(len(board)):
+        for j in range(len(board[0])):
+            if board[i][j] in ("G", "R"):
+                output.set(i, j, board[i][j])
+    return output
+
 def initiate_board(nbRows,nbCols):
     """
     De functie maakt een nieuw leeg bord aan met nbRows rijen en nbCols kolommen.
 
     Het bord is een matrix bestaande uit nbRows rijen en nbCols kolommen. Elk vakje bevat telkens een spatie
-    (" ") om aan te duiden dat het vakje leeg is.
+    (" ") om aan te duiden dat het vakje leeg is. Het bord is een 'Board', dat zich ook als lijst van rijen gedraagt.
 
     Deze functie geeft het bord terug.
     Wanneer er een ongeldige invoer is (nbRows is < 1, nbCols is < 1),
@@ -29,14 +246,7 @@ def initiate_board(nbRows,nbCols):
     if nbRows < 1 or nbCols < 1:
         return None
 
-    board = []
-
-    for i in range(nbRows):
-        board.append([])
-        for j in range(nbCols):
-            board[i].append(" ")
-
-    return board
+    return Board(nbRows, nbCols)
 
 def putGreen(board,x,y):
     """
@@ -52,7 +262,10 @@ def putGreen(board,x,y):
         #print("x,y buiten range", x, y, len(board), len(board[0]))
         return board
 
-    board[x][y] = "G"
+    if isinstance(board, Board):
+        board.set(x, y, "G")
+    else:
+        board[x][y] = "G"
 
     return board
 
@@ -71,12 +284,587 @@ def putRed(board, x, y):
         #print("x,y buiten range", x, y, len(board), len(board[0]))
         return board
 
-    board[x][y] = "R"
+    if isinstance(board, Board):
+        board.set(x, y, "R")
+    else:
+        board[x][y] = "R"
 
     return board
 
 
 
+###################################################################################################################
+############# CACHES ##############################################################################################
+###################################################################################################################
+
+# Bij het herhaaldelijk plannen op bijna dezelfde borden worden dezelfde deelroutes telkens opnieuw gezocht. Die
+# worden bewaard in een begrensde LRU-cache met als sleutel de fingerprint van het bord (enkel de rode schijfjes),
+# de kostconstanten en (start, finish, rijrichting). Ook de volledige routes van 'planRoute' worden bewaard (zie
+# SYMMETRIE hieronder).
+# Een bord met een extra rood schijfje heeft een andere fingerprint, maar een deelroute die niet over een nieuw rood
+# schijfje loopt blijft de snelste (er vallen enkel wegen weg), en 'headingSearchAll' kiest bij gelijke tijden ook
+# dezelfde (afgeronde tijden, vaste volgorde). SEGMENT_REUSE onthoudt daarom per (afmetingen, kosten) de laatste
+# SEGMENT_VARIANTS borden (fingerprint, rode schijfjes) waarvoor 'headingSearchAll' deelroutes in SEGMENT_CACHE zette:
+# zo'n deelroute mag gebruikt worden als die rode schijfjes er nog allemaal liggen en de route over geen enkel huidig
+# rood schijfje loopt (zie 'segmentLookup'). Zo hoeft na een nieuw rood schijfje enkel wat erover liep opnieuw gezocht
+# te worden. De deelroutes zelf staan enkel in SEGMENT_CACHE; SEGMENT_REUSE kost dus geen geheugen per deelroute.
+# 'headingSearch' (A*, voor 'fastestRoute') kiest bij gelijke tijden soms een andere route dan 'headingSearchAll', met
+# een andere rijrichting bij vertrek of aankomst. Zijn resultaten staan daarom apart in PATH_CACHE, zodat de
+# segmenttabel van een tour niet afhangt van welke zoektocht eerst gelopen heeft.
+
+RED_MASK = bytes(1 if c == ord("R") else 0 for c in range(256)) # vertaaltabel: "R" -> 1, al de rest -> 0
+
+class LRUCache:
+    """
+        Begrensde cache die bij een volle cache het langst niet gebruikte element verwijdert.
+        'hits' en 'misses' tellen de geslaagde en mislukte opzoekingen. Met maxsize 0 wordt niets bewaard.
+        Als 'disk' een DiskCache is, wordt elk nieuw element ook daar bewaard onder de soort 'kind', en wordt een
+        element dat niet in het geheugen zit daar nog opgezocht (zie SCHIJFCACHE).
+    """
+
+    __slots__ = ("maxsize", "data", "hits", "misses", "kind", "disk")
+
+    def __init__(self, maxsize=4096, kind=None):
+        self.maxsize = maxsize
+        self.data = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.kind = kind
+        self.disk = None
+
+    def get(self, key, default=None):
+        try:
+            value = self.data[key]
+        except KeyError:
+            if self.disk is not None:
+                value = self.disk.get(self.kind, key, NOT_FOUND)
+                if value is not NOT_FOUND:
+                    self.hits += 1
+                    self.remember_help(key, value)
+                    return value
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def match(self, key, accept):
+        """
+            Zoals 'get' voor een cache met lijsten als waarden: geeft het eerste element van de lijst onder 'key'
+            terug waarvoor accept(element) waar is, of NOT_FOUND. Enkel dan telt de opzoeking als hit.
+        """
+
+        for value in self.data.get(key, ()):
+            if accept(value):
+                self.data.move_to_end(key)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return NOT_FOUND
+
+    def push(self, key, value, limit):
+        """
+            Voegt 'value' vooraan toe aan de lijst onder 'key' (een gelijk element verhuist naar voren) en houdt er
+            hoogstens 'limit' elementen van over.
+        """
+
+        if self.maxsize <= 0:
+            return
+        self.remember_help(key, ([value] + [v for v in self.data.get(key, ()) if v != value])[:limit])
+
+    def peek(self, key, default=None):
+        """
+            Zoals 'get', maar zonder te tellen, zonder de volgorde te wijzigen en zonder de schijfcache.
+        """
+
+        return self.data.get(key, default)
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self.remember_help(key, value)
+        if self.disk is not None:
+            self.disk.put(self.kind, key, value)
+
+    def remember_help(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self.data) > max(maxsize, 0):
+            self.data.popitem(last=False)
+
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self.data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+SEGMENT_CACHE = LRUCache(4096, "segment") # deelroutes: (fingerprint, kosten, start, finish, rijrichting) -> resultaat
+SEGMENT_REUSE = LRUCache(4096)            # borden: (afmetingen, kosten) -> [(fingerprint, rood)]
+PATH_CACHE = LRUCache(4096, "path")       # headingSearch: (fingerprint, kosten, start, finish, rijrichting) -> resultaat
+ROUTE_CACHE = LRUCache(1024, "route")     # planRoute: (canonieke vorm, methode, kosten) -> (tijd, canonieke route)
+NOT_FOUND = object()           # markeert in SEGMENT_CACHE dat er geen route bestaat
+SEGMENT_VARIANTS = 4           # aantal bewaarde borden per (afmetingen, kosten) in SEGMENT_REUSE
+
+def configureCaches(segment_size=None, route_size=None):
+    """
+        De functie past de maximale grootte van de caches aan (0 schakelt een cache uit). 'segment_size' geldt voor
+        SEGMENT_CACHE, SEGMENT_REUSE en PATH_CACHE.
+    """
+
+    if segment_size is not None:
+        SEGMENT_CACHE.resize(segment_size)
+        SEGMENT_REUSE.resize(segment_size)
+        PATH_CACHE.resize(segment_size)
+    if route_size is not None:
+        ROUTE_CACHE.resize(route_size)
+
+def cacheStats():
+    """
+        De functie geeft de statistieken (grootte, hits, misses, hit_rate) van alle caches terug.
+    """
+
+    output = {'segments': SEGMENT_CACHE.stats(), 'reused': SEGMENT_REUSE.stats(), 'paths': PATH_CACHE.stats(),
+              'routes': ROUTE_CACHE.stats()}
+    if DISK_CACHE is not None:
+        output['disk'] = DISK_CACHE.stats()
+    return output
+
+def segmentKey(board, start, finish, start_direction):
+    return (board.fingerprint(), TIMESTRAIGHT, TIMETURN, start, finish, start_direction)
+
+def segmentLookup(board, start, finish, start_direction):
+    """
+        De functie zoekt een deelroute op in SEGMENT_CACHE en anders in SEGMENT_REUSE (zie hierboven). Ze geeft het
+        resultaat terug zoals bij 'headingSearch' (None als er geen route is), of NOT_FOUND.
+    """
+
+    key = segmentKey(board, start, finish, start_direction)
+    cached = SEGMENT_CACHE.get(key, NOT_FOUND)
+    if cached is not NOT_FOUND:
+        return cached
+
+    reds = board.reds
+    found = []
+
+    def accept(version):
+        old = SEGMENT_CACHE.peek((version[0],) + key[1:], NOT_FOUND)
+        if old is NOT_FOUND or not version[1] <= reds or (old is not None and not reds.isdisjoint(old[1])):
+            return False
+        found.append(old)
+        return True
+
+    if SEGMENT_REUSE.match((board.rows, board.cols, TIMESTRAIGHT, TIMETURN), accept) is NOT_FOUND:
+        return NOT_FOUND
+    SEGMENT_CACHE.put(key, found[0])
+    return found[0]
+
+def segmentStore(board, start, finish, start_direction, result):
+    """
+        De functie bewaart een resultaat van 'headingSearchAll' in SEGMENT_CACHE en onthoudt het bord in SEGMENT_REUSE.
+    """
+
+    key = segmentKey(board, start, finish, start_direction)
+    SEGMENT_CACHE.put(key, result)
+    shape = (board.rows, board.cols, TIMESTRAIGHT, TIMETURN)
+    versions = SEGMENT_REUSE.peek(shape, ())
+    if not versions or versions[0][0] != key[0]:
+        SEGMENT_REUSE.push(shape, (key[0], board.redSet()), SEGMENT_VARIANTS)
+
+# SYMMETRIE
+# Een gedraaid of gespiegeld bord (met de start, de finish en de rijrichting mee gedraaid) heeft dezelfde snelste
+# route, mee gedraaid: een rechte stap en een kwartslag kosten in elke richting evenveel. Elk bord wordt daarom
+# herleid tot een canonieke vorm, de kleinste van de 8 symmetrieen van het rooster. Een symmetrie is een tupel
+# (transponeren, rijen omkeren, kolommen omkeren), in die volgorde toegepast; transponeren wisselt rijen en kolommen
+# en maakt van een 4x6-bord dus een 6x4-bord. 'planRoute' lost altijd de canonieke vorm op en draait de route terug:
+# zo geven alle standen van een bord dezelfde route, ook bij de tour-solvers, die tussen even snelle deelroutes
+# kiezen. ROUTE_CACHE bewaart de route in de canonieke vorm.
+
+SYMMETRIES = tuple((transpose, flip_rows, flip_cols) for transpose in (False, True)
+                   for flip_rows in (False, True) for flip_cols in (False, True))
+ROUTE_CACHE_METHODS = ("permutations", "heldkarp", "branchbound", "parallel", "exact") # "heuristic" hangt af van de rekentijd
+
+def symmetryPosition(pos, rows, cols, symmetry):
+    """
+        De functie geeft de positie van 'pos' (op een bord van rows x cols) na 'symmetry' terug.
+    """
+
+    x, y = pos
+    transpose, flip_rows, flip_cols = symmetry
+    if transpose:
+        x, y, rows, cols = y, x, cols, rows
+    if flip_rows:
+        x = rows - 1 - x
+    if flip_cols:
+        y = cols - 1 - y
+    return (x, y)
+
+def symmetryInverse(pos, rows, cols, symmetry):
+    """
+        De functie draait 'symmetryPosition' terug: 'pos' ligt op het getransformeerde bord, 'rows' en 'cols' zijn
+        de afmetingen van het oorspronkelijke bord.
+    """
+
+    x, y = pos
+    transpose, flip_rows, flip_cols = symmetry
+    if transpose:
+        rows, cols = cols, rows
+    if flip_rows:
+        x = rows - 1 - x
+    if flip_cols:
+        y = cols - 1 - y
+    return (y, x) if transpose else (x, y)
+
+def symmetryDirection(direction, symmetry):
+    """
+        De functie geeft de rijrichting (0 = up, 1 = right, 2 = down, 3 = left, of None) na 'symmetry' terug.
+    """
+
+    if direction is None:
+        return None
+    dx, dy = RICHTINGEN[direction]
+    transpose, flip_rows, flip_cols = symmetry
+    if transpose:
+        dx, dy = dy, dx
+    return RICHTINGEN.index((-dx if flip_rows else dx, -dy if flip_cols else dy))
+
+def canonicalBoard(board, start, finish, start_direction=None):
+    """
+        De functie geeft de canonieke vorm van het bord met 'start', 'finish' en 'start_direction' terug als tupel
+        (sleutel, symmetrie). Borden die elkaars rotatie of spiegelbeeld zijn hebben dezelfde sleutel; de symmetrie
+        zet het bord om naar die canonieke vorm (zie 'symmetryPosition').
+    """
+
+    cols = board.cols
+    lines = [bytes(board.cells[x * cols:(x + 1) * cols]) for x in range(board.rows)]
+    transposed = [bytes(column) for column in zip(*lines)]
+    best = None
+    for symmetry in SYMMETRIES:
+        transpose, flip_rows, flip_cols = symmetry
+        cells = transposed if transpose else lines
+        if flip_rows:
+            cells = cells[::-1]
+        if flip_cols:
+            cells = [line[::-1] for line in cells]
+        direction = symmetryDirection(start_direction, symmetry)
+        key = (len(cells), len(cells[0]), b"".join(cells),
+               symmetryPosition(start, board.rows, cols, symmetry), symmetryPosition(finish, board.rows, cols, symmetry),
+               -1 if direction is None else direction)
+        if best is None or key < best[0]:
+            best = (key, symmetry)
+    return best
+
+# SCHIJFCACHE
+# Met 'openDiskCache' worden de deelroutes (SEGMENT_CACHE, PATH_CACHE) en de routes van 'planRoute' (ROUTE_CACHE) ook
+# bewaard in een lokaal SQLite-bestand, zodat een nieuwe run of de planningsdienst een gekend bord meteen terugvindt.
+# Zonder code aan te passen kan dat ook met de omgevingsvariabele KORTSTEROUTE_CACHE=<bestand>.
+# De sleutel is een hash van PLANNER_VERSION, de soort ("segment", "path" of "route") en de sleutel van de cache in het
+# geheugen, die de fingerprint of canonieke vorm van het bord en de kostconstanten al bevat. Verhoog PLANNER_VERSION
+# als een planner andere routes geeft: de oude elementen worden dan niet meer gevonden en verdwijnen vanzelf.
+# Als er meer dan 'max_entries' elementen zijn, worden de langst niet gebruikte verwijderd (een tiende extra, zodat
+# dat niet bij elke nieuwe deelroute moet). Een fout in het bestand geeft geen fout in de planner: de opzoeking
+# telt dan als een miss en wordt geteld in "errors". Een bestand dat niet geopend kan worden geeft bij
+# 'openDiskCache' een ValueError; voor KORTSTEROUTE_CACHE wordt er dan zonder schijfcache verder gewerkt (met een
+# waarschuwing op stderr).
+
+PLANNER_VERSION = 2 # 2: de resultaten van headingSearch staan apart (soort "path")
+DISK_CACHE_ENTRIES = 200000
+DISK_FLUSH_SIZE = 1024 # zoveel nieuwe elementen worden hoogstens in het geheugen verzameld voor 'flush'
+DISK_CACHE = None # de geopende DiskCache, of None
+
+def decodeSegment_help(value):
+    return None if value is None else (value[0], [tuple(pos) for pos in value[1]], value[2])
+
+def decodeRoute_help(value):
+    return (value[0], None if value[1] is None else tuple(tuple(pos) for pos in value[1]))
+
+DISK_DECODERS = {"segment": decodeSegment_help, "path": decodeSegment_help, "route": decodeRoute_help}
+
+class DiskCache:
+    """
+        Persistente cache in een SQLite-bestand (zie hierboven). De waarden worden als JSON bewaard en bij het
+        opzoeken terug omgezet met DISK_DECODERS. Nieuwe elementen en de gebruikstijden van gevonden elementen
+        worden in het geheugen verzameld en met 'flush' in een transactie weggeschreven ('planRoute' doet dat na
+        elk bord, en vanzelf zodra er DISK_FLUSH_SIZE wachten). Na een fork (bv. bij planBatch) opent elk proces
+        een eigen verbinding.
+    """
+
+    __slots__ = ("path", "max_entries", "connection", "pid", "lock", "pending", "touched", "count", "hits",
+                 "misses", "writes", "evictions", "errors")
+
+    def __init__(self, path, max_entries=DISK_CACHE_ENTRIES):
+        if sqlite3 is None:
+            raise ImportError("!!! Error !!!: sqlite3 is niet beschikbaar, de schijfcache kan niet gebruikt worden")
+        self.path = path
+        self.max_entries = max_entries
+        self.connection = None
+        self.pid = None
+        self.lock = threading.Lock()
+        self.pending = {} # sleutel -> JSON-tekst, nog niet weggeschreven
+        self.touched = {} # sleutel -> tijdstip van het laatste gebruik, nog niet weggeschreven
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        try:
+            self.count = self.connection_help().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        except sqlite3.Error as e: # bv. een bestand dat geen SQLite-databank is, of een map die niet bestaat
+            if self.connection is not None:
+                self.connection.close()
+            self.connection = None
+            raise ValueError(f"!!! Error !!!: De schijfcache '{path}' kan niet geopend worden ({e})") from e
+
+    def connection_help(self):
+        if self.pid != os.getpid():
+            # na een fork horen de wachtende elementen bij het ouderproces, dat ze zelf wegschrijft
+            self.pending = {}
+            self.touched = {}
+            self.connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS entries "
+                                    "(key BLOB PRIMARY KEY, value TEXT NOT NULL, used REAL NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used)")
+            self.pid = os.getpid()
+        return self.connection
+
+    def key_help(self, kind, key):
+        return hashlib.blake2b(repr((PLANNER_VERSION, kind, key)).encode(), digest_size=16).digest()
+
+    def get(self, kind, key, default=None):
+        digest = self.key_help(kind, key)
+        with self.lock:
+            try:
+                connection = self.connection_help()
+                text = self.pending.get(digest)
+                if text is None:
+                    row = connection.execute("SELECT value FROM entries WHERE key = ?", (digest,)).fetchone()
+                    if row is not None:
+                        text = row[0]
+                        self.touched[digest] = time.time()
+            except sqlite3.Error:
+                self.errors += 1
+                text = None
+        if text is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return DISK_DECODERS[kind](json.loads(text))
+
+    def put(self, kind, key, value):
+        digest = self.key_help(kind, key)
+        text = json.dumps(value, separators=(",", ":"))
+        with self.lock:
+            self.pending[digest] = text
+            full = len(self.pending) >= DISK_FLUSH_SIZE
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+            Schrijft de wachtende elementen en gebruikstijden weg in een transactie en verwijdert daarna zo nodig de
+            langst niet gebruikte elementen.
+        """
+
+        with self.lock:
+            if not self.pending and not self.touched:
+                return
+            try:
+                connection = self.connection_help()
+                now = time.time()
+                count = self.count + len(self.pending)
+                evicted = 0
+                connection.execute("BEGIN")
+                try:
+                    connection.executemany("INSERT OR REPLACE INTO entries (key, value, used) VALUES (?, ?, ?)",
+                                           [(digest, text, now) for digest, text in self.pending.items()])
+                    connection.executemany("UPDATE entries SET used = ? WHERE key = ?",
+                                           [(used, digest) for digest, used in self.touched.items()])
+                    if count > self.max_entries:
+                        count, evicted = self.evict_help(connection)
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+                # pas na de COMMIT: een teruggedraaide transactie verandert de tellers niet
+                self.count = count
+                self.evictions += evicted
+                self.writes += len(self.pending)
+            except sqlite3.Error:
+                self.errors += 1
+            self.pending = {}
+            self.touched = {}
+
+    def evict_help(self, connection):
+        # geeft (aantal elementen, aantal verwijderd) terug; 'count' telt ook vervangen elementen mee: eerst het
+        # echte aantal opvragen
+        count = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return count, 0
+        excess += self.max_entries // 10
+        connection.execute("DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used LIMIT ?)", (excess,))
+        return max(count - excess, 0), excess
+
+    def clear(self):
+        with self.lock:
+            self.pending = {}
+            self.touched = {}
+            self.connection_help().execute("DELETE FROM entries")
+            self.count = 0
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            if self.connection is not None and self.pid == os.getpid():
+                self.connection.close()
+            self.connection = None
+            self.pid = None
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'path': self.path,
+            'size': self.count + len(self.pending),
+            'maxsize': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'writes': self.writes,
+            'pending': len(self.pending),
+            'evictions': self.evictions,
+            'errors': self.errors,
+        }
+
+def openDiskCache(path, max_entries=DISK_CACHE_ENTRIES):
+    """
+        De functie opent (of maakt) de schijfcache in het bestand 'path' en koppelt ze aan SEGMENT_CACHE, PATH_CACHE
+        en ROUTE_CACHE. Een eerder geopende schijfcache wordt eerst gesloten. De functie geeft de DiskCache terug.
+        Een bestand dat niet geopend kan worden of geen SQLite-databank is, geeft een ValueError.
+    """
+
+    global DISK_CACHE
+    closeDiskCache()
+    DISK_CACHE = DiskCache(path, max_entries)
+    SEGMENT_CACHE.disk = DISK_CACHE
+    PATH_CACHE.disk = DISK_CACHE
+    ROUTE_CACHE.disk = DISK_CACHE
+    atexit.register(closeDiskCache)
+    return DISK_CACHE
+
+def closeDiskCache():
+    """
+        De functie sluit de schijfcache (als die open is); de caches in het geheugen blijven bestaan.
+    """
+
+    global DISK_CACHE
+    SEGMENT_CACHE.disk = None
+    PATH_CACHE.disk = None
+    ROUTE_CACHE.disk = None
+    if DISK_CACHE is not None:
+        DISK_CACHE.close()
+        DISK_CACHE = None
+    atexit.unregister(closeDiskCache)
+
+if os.environ.get("KORTSTEROUTE_CACHE"):
+    try:
+        openDiskCache(os.environ["KORTSTEROUTE_CACHE"])
+    except Exception as e: # bv. de ValueError van een ongeldig bestand: zonder schijfcache verder werken
+        closeDiskCache()
+        print(f"!!! Waarschuwing !!!: verder zonder schijfcache ({e})", file=sys.stderr)
+
+###################################################################################################################
+############# STATISTIEKEN ########################################################################################
+###################################################################################################################
+
+# Alle planners ('fastestRoute', 'collect', 'planRoute', de tour-solvers, 'collectExact' en 'Replanner.replan') vullen
+# optioneel een dictionary 'stats' in, bv. stats = {}; collect(board, start, finish, "heldkarp", stats=stats).
+#   "phases"                      duur per fase in seconden ("segments", "order", "route", "search", "repair")
+#   "nodes"                       bekeken toestanden (vak, rijrichting) bij het zoeken van deelroutes
+#   "segments"                    aantal deelroutes in de segmenttabel
+#   "cache_hits", "cache_misses"  opzoekingen in SEGMENT_CACHE en SEGMENT_REUSE (PATH_CACHE voor 'fastestRoute')
+#   "route_cache"                 "hit" of "miss" voor de volledige route in ROUTE_CACHE (enkel bij ROUTE_CACHE_METHODS)
+#   "expanded", "pruned"          bekeken en geschrapte toestanden (branchbound, parallel, exact)
+#   "evaluated"                   beoordeelde volgordes (permutations, heuristic) of DP-toestanden (heldkarp)
+# Tijdens lange zoektochten wordt de tussenstand regelmatig doorgegeven aan de functie die met 'setProgressHook'
+# ingeplugd is. Zonder code aan te passen kan dat ook met de omgevingsvariabele KORTSTEROUTE_PROGRESS=<seconden>,
+# die de tussenstand naar stderr laat afdrukken.
+
+PROGRESS_HOOK = None     # functie(fase, stats), of None
+PROGRESS_INTERVAL = 1.0  # minimale tijd (seconden) tussen twee oproepen van PROGRESS_HOOK
+progress_next = 0.0
+cancel_state = threading.local() # cancel_state.event: threading.Event om de zoektocht in deze thread af te breken
+
+class SearchCancelled(Exception):
+    """
+        Wordt opgegooid in een zoektocht die afgebroken werd (zie 'collectProgressive').
+    """
+
+def setProgressHook(hook, interval=1.0):
+    """
+        De functie plugt 'hook' in: tijdens lange zoektochten wordt hook(fase, stats) hoogstens om de 'interval'
+        seconden opgeroepen met de naam van de fase en de tellers tot nu toe. Met hook=None wordt het uitgeschakeld.
+    """
+
+    global PROGRESS_HOOK, PROGRESS_INTERVAL, progress_next
+    PROGRESS_HOOK = hook
+    PROGRESS_INTERVAL = interval
+    progress_next = 0.0
+
+def progress_help(phase, stats):
+    """
+        roept PROGRESS_HOOK op als er sinds de vorige keer minstens PROGRESS_INTERVAL seconden verstreken zijn, en
+        gooit SearchCancelled op als de zoektocht in deze thread afgebroken moet worden.
+    """
+
+    global progress_next
+    event = getattr(cancel_state, "event", None)
+    if event is not None and event.is_set():
+        raise SearchCancelled(phase)
+    if PROGRESS_HOOK is None:
+        return
+    now = time.perf_counter()
+    if now >= progress_next:
+        progress_next = now + PROGRESS_INTERVAL
+        PROGRESS_HOOK(phase, stats)
+
+def phase_help(stats, phase, started):
+    """
+        telt de tijd sinds 'started' op bij de fase 'phase' in stats["phases"] en geeft het huidige tijdstip terug.
+    """
+
+    now = time.perf_counter()
+    phases = stats.setdefault("phases", {})
+    phases[phase] = phases.get(phase, 0.0) + now - started
+    return now
+
+def printProgress(phase, stats):
+    """
+        De functie drukt de tussenstand van een zoektocht af naar stderr (bruikbaar als hook voor 'setProgressHook').
+    """
+
+    counters = ", ".join(f"{key}={value}" for key, value in stats.items() if key != "phases")
+    print(f"[{time.strftime('%H:%M:%S')}] {phase}: {counters}", file=sys.stderr)
+
+if os.environ.get("KORTSTEROUTE_PROGRESS"):
+    setProgressHook(printProgress, float(os.environ["KORTSTEROUTE_PROGRESS"]))
+
 ###################################################################################################################
 ############# HULP-FUNCTIES ######################################################################################
 ###################################################################################################################
@@ -86,6 +874,9 @@ def getGreens(board):
         De functie geeft een set terug met de posities van alle groene schijfjes van het bord
     """
 
+    if isinstance(board, Board):
+        return set(board.greens)
+
     output = set()
 
     for i in range(len(board)):
@@ -99,7 +890,10 @@ def getReds(board):
     """
         De functie geeft een set terug met de posities van alle rode schijfjes van het bord
     """
-    
+
+    if isinstance(board, Board):
+        return set(board.reds)
+
     output = set()
 
     for i in range(len(board)):
@@ -107,226 +901,1963 @@ def getReds(board):
             if board[i][j] == "R":
                 output.add((i,j))
 
-    return output
+    return output
+
+
+def getLegalNeighbours(board,pos):
+    """
+        De functie geeft een set terug met alle toegestane posities waar een wagentje naar toe kan
+        bewegen vanuit de gegeven positie 'pos'. De functie houdt daarbij rekening met de randen van het bord en
+        de posities waar er zich een rood schijfje bevindt.
+    """
+
+    if isinstance(board, Board):
+        return {board.position(j) for _, j in board.moves[board.index(pos)]}
+
+    output = set()
+    x, y = pos
+    max_x = len(board)
+    max_y = len(board[0])
+
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    for dx, dy in directions:
+        new_x = x + dx
+        new_y = y + dy
+
+        if 0 <= new_x < max_x and 0 <= new_y < max_y and board[new_x][new_y] != "R":
+            output.add((new_x, new_y))
+
+    return output
+
+def calculateTime(route):
+    """
+        De functie berekent de tijd die het wagentje nodig heeft om de gegeven route te rijden. De functie gebruikt
+        hiervoor de constanten TIMESTRAIGHT en TIMETURN.
+
+        Je mag ervan uitgaan dat het wagentje op de startpositie van de route de juiste orientatie bevat en niet meer
+        hoeft te draaien om de eerste stap te zetten.
+
+        Je mag ervan uitgaan dat route een geldige route is, zijnde een lijst van tupels die de achtereenvolgende coordinaten
+        bevat waar het wagentje zich stap voor stap bevindt.
+    """
+
+    output = 0
+    prev = route[0]
+    prev_direction = 0
+    direction = 0 # 0 = up, 1 = right, 2 = down, 3 = left
+    straight = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+    if len(route) <= 0:
+        return 0
+    
+    if route[0][0] == route[1][0]:
+        if route[0][1] < route[1][1]:
+            direction = 1
+        else:
+            direction = 3
+    else:
+        if route[0][0] < route[1][0]:
+            direction = 2
+        else:
+            direction = 0
+
+    #print(direction, "direction")
+    #print(straight[direction], "straight", (prev + straight[direction]), "prev + straight[direction]")
+    
+    for i, pos in enumerate(route):
+        if pos == prev:
+            #print(f"+0, totaal: {output}")
+            continue
+        if pos == (prev[0] + straight[direction][0], prev[1] + straight[direction][1]):
+            output += TIMESTRAIGHT
+            #print(f"+{TIMESTRAIGHT} (straight), totaal: {output}")
+        else:
+            prev_direction = direction
+            if prev[0] == route[i][0]:
+                if prev[1] < route[i][1]:
+                    direction = 1
+                else:
+                    direction = 3
+            else:
+                if prev[0] < route[i][0]:
+                    direction = 2
+                else:
+                    direction = 0
+            turn_steps = min(abs(prev_direction - direction), 4 - abs(prev_direction - direction))
+            output += TIMESTRAIGHT + (TIMETURN*turn_steps)
+            #print(f"+{TIMESTRAIGHT + (TIMETURN*turn_steps)} (turn + straight), totaal: {output}")
+        prev = pos
+
+    return output
+
+def turnTime(direction, new_direction):
+    """
+        De functie geeft de draaitijd terug om van rijrichting 'direction' naar 'new_direction' te draaien, net zoals
+        'calculateTime' die rekent (TIMETURN per kwartslag, een 180 graden draai telt dus dubbel).
+
+        Een richting 'None' betekent dat het wagentje nog geen richting heeft (begin van een route), dan is draaien gratis.
+    """
+
+    if direction is None or new_direction is None:
+        return 0
+    turn_steps = abs(direction - new_direction)
+    return TIMETURN * min(turn_steps, 4 - turn_steps)
+
+# Geeft alleen posities en oppakken info, geen draaibewegingen, dus wordt niet gebruikt
+def makeInstructionfile(route, board):
+    """
+        De functie genereert een .txt-bestand dat kan gebruikt worden je wagentje de opgegeven route te laten rijden op het
+        opgegeven board.
+
+        Elke regel van het bestand drie met een komma van elkaar gescheiden waarden, namelijk:
+        rijnummer, kolomnummer, True/False
+        waarbij de derde waarde een boolean is die aangeeft of er op de gegeven positie een groen schijfje dient opgepikt
+        te worden.
+
+        De functie gaat ervan uit dat "route" een geldige route is voor het opgegeven "board".
+    """
+    file = open('instructions.txt','w')
+    for pos in route:
+        pickup = "False"
+        if board[pos[0]][pos[1]] == "G":
+            pickup = "True"
+        outputstring = str(pos[0])+", "+str(pos[1]) +", " + pickup + "\n"
+        file.write(outputstring)
+    file.close()
+
+###################################################################################################################
+############# ROUTE-COMPILER - instructies voor het wagentje en de website ########################################
+###################################################################################################################
+
+# Een route wordt in een keer overlopen door 'routeInstructions', die de instructies een voor een teruggeeft als
+# tupels (actie, positie): "L", "R" en "T180" (draaien, positie None), "F" (een vak vooruit, positie = het nieuwe vak),
+# "P" (groen schijfje oppakken, positie = het vak), "W<seconden>" (wachten op het vak, bv. "W2.4", positie None,
+# enkel bij meerdere wagentjes, zie 'planFleet') en als laatste "S" (stop, positie None). 'compileRoute' geeft elke
+# instructie door aan een of meer emitters, die er elk hun eigen formaat van maken:
+#   TokenEmitter    lijst van instructies, zoals 'makeInstructions' die teruggeeft
+#   PicoEmitter     instructions.txt voor het wagentje (een instructie per regel, of compact: "F3" = drie keer "F")
+#   WebsiteEmitter  website.json voor het dashboard
+# Een emitter heeft een methode emit(actie, positie) en close(), en telt in 'size' het aantal geschreven tekens.
+
+def routeInstructions(route, board, start_direction=1, greens=None, waits=None):
+    """
+        Generator die de instructies voor 'route' een voor een teruggeeft als tupels (actie, positie), zie hierboven.
+        'start_direction' is de rijrichting op de start (0 = up, 1 = right, 2 = down, 3 = left). Een groen schijfje
+        wordt opgepikt de eerste keer dat de route op zijn vak rijdt, met 'greens' enkel de groene schijfjes uit die
+        verzameling. 'waits' is een dictionary {i: seconden} om op route[i] te wachten voor de volgende stap.
+        Een route zonder stappen geeft geen instructies.
+    """
+
+    if len(route) <= 1:
+        return
+
+    turns = (None, "R", "T180", "L") # per aantal kwartslagen naar rechts
+    collected_greens = set() # groene torentjes die al zijn opgepakt bijhouden
+    direction = start_direction
+    prev = route[0]
+
+    for i, curr in enumerate(route[1:]):
+        try:
+            target_direction = RICHTINGEN.index((curr[0] - prev[0], curr[1] - prev[1]))
+        except ValueError:
+            raise ValueError(f"!!! Error !!!: Onmogelijke stap, van {prev} naar {curr}")
+
+        if waits and waits.get(i):
+            yield f"W{round(waits[i], 3):g}", None
+        turn = turns[(target_direction - direction) % 4]
+        if turn is not None:
+            yield turn, None
+        curr = (curr[0], curr[1])
+        yield "F", curr
+        if board[curr[0]][curr[1]] == "G" and curr not in collected_greens and (greens is None or curr in greens):
+            collected_greens.add(curr)
+            yield "P", curr
+
+        direction = target_direction
+        prev = curr
+
+    yield "S", None
+
+class TokenEmitter:
+    """
+        Emitter die de instructies verzamelt in de lijst 'tokens' ("F", "L", "R", "T180", "P", "S").
+    """
+
+    __slots__ = ("tokens", "size")
+
+    def __init__(self):
+        self.tokens = []
+        self.size = 0
+
+    def emit(self, action, pos):
+        self.tokens.append(action)
+        self.size += len(action) + 1
+
+    def close(self):
+        pass
+
+class PicoEmitter:
+    """
+        Emitter voor instructions.txt: een instructie per regel, zonder regeleinde na de laatste.
+        Met 'compact' worden opeenvolgende "F"'s samengevoegd tot een regel "F<aantal>" (bv. "F3"), een enkele "F"
+        blijft "F". code.py leest beide formaten.
+        'file' is een open bestand of een ander object met een methode write.
+    """
+
+    __slots__ = ("file", "size", "compact", "forward")
+
+    def __init__(self, file, compact=False):
+        self.file = file
+        self.size = 0
+        self.compact = compact
+        self.forward = 0 # aantal "F"'s dat nog geschreven moet worden (enkel bij 'compact')
+
+    def write_help(self, action):
+        text = action if self.size == 0 else "\n" + action
+        self.file.write(text)
+        self.size += len(text)
+
+    def flush_help(self):
+        if self.forward:
+            self.write_help("F" if self.forward == 1 else f"F{self.forward}")
+            self.forward = 0
+
+    def emit(self, action, pos):
+        if self.compact:
+            if action == "F":
+                self.forward += 1
+                return
+            self.flush_help()
+        self.write_help(action)
+
+    def close(self):
+        self.flush_help()
+
+class WebsiteEmitter:
+    """
+        Emitter voor website.json: de afmetingen, het bord en de instructies voor het dashboard, compact geschreven
+        (zonder inspringen). Een "F" bevat ook de rij en kolom van het nieuwe vak.
+        'file' is een open bestand of een ander object met een methode write.
+    """
+
+    __slots__ = ("file", "size", "first")
+
+    def __init__(self, file, board):
+        self.file = file
+        self.size = 0
+        self.first = True
+        rows = [['G' if cell == 'G' else 'R' if cell == 'R' else ' ' for cell in row] for row in board]
+        header = json.dumps({'dimensions': {'rows': len(board), 'cols': len(board[0])}, 'board': rows},
+                            separators=(",", ":"))
+        self.write_help(header[:-1] + ',"instructions":[')
+
+    def write_help(self, text):
+        self.file.write(text)
+        self.size += len(text)
+
+    def emit(self, action, pos):
+        if action == "F":
+            text = f'{{"action":"F","row":{pos[0]},"col":{pos[1]}}}'
+        else:
+            text = f'{{"action":"{action}"}}'
+        self.write_help(text if self.first else "," + text)
+        self.first = False
+
+    def close(self):
+        self.write_help("]}")
+
+def compileRoute(route, board, emitters, start_direction=1, greens=None, waits=None):
+    """
+        De functie overloopt 'route' een keer en geeft elke instructie door aan alle 'emitters' (zie hierboven),
+        die daarna afgesloten worden. De bestanden zelf worden niet gesloten. De functie geeft het aantal
+        instructies terug. Zie 'routeInstructions' voor 'greens' en 'waits'.
+    """
+
+    count = 0
+    for action, pos in routeInstructions(route, board, start_direction, greens, waits):
+        for emitter in emitters:
+            emitter.emit(action, pos)
+        count += 1
+    for emitter in emitters:
+        emitter.close()
+    return count
+
+def open_help(file):
+    """
+        geeft (bestand, zelf_geopend) terug: 'file' is een bestandsnaam (wordt geopend om te schrijven) of al een
+        object met een methode write.
+    """
+
+    if hasattr(file, "write"):
+        return file, False
+    return open(file, 'w'), True
+
+def makeInstructions(route, board, start_direction=1):
+    """
+        De functie zet een route om in de lijst instructies voor het wagentje: "F" (vooruit), "L", "R", "T180"
+        (draaien), "P" (groen schijfje oppakken) en als laatste "S" (stop). 'start_direction' is de rijrichting op de
+        start (0 = up, 1 = right, 2 = down, 3 = left). Een route zonder stappen geeft een lege lijst.
+    """
+
+    emitter = TokenEmitter()
+    compileRoute(route, board, [emitter], start_direction)
+    return emitter.tokens
+
+# Geeft ook draaibewegingen
+def makeInstructionfile2(route, board, start_direction=1, file='instructions.txt', compact=False):
+    if len(route) <= 1:
+            return
+
+    file, opened = open_help(file)
+    compileRoute(route, board, [PicoEmitter(file, compact)], start_direction)
+    if opened:
+        file.close()
+
+# info voor website
+def makeWebsiteFile(route, board, file='website.json', start_direction=1):
+    file, opened = open_help(file)
+    compileRoute(route, board, [WebsiteEmitter(file, board)], start_direction)
+    if opened:
+        file.close()
+
+def makeRouteFiles(route, board, start_direction=1, instructions='instructions.txt', website='website.json',
+                   compact=False, greens=None):
+    """
+        De functie schrijft instructions.txt en website.json in een keer door de route (zie 'compileRoute').
+        'instructions' en 'website' zijn bestandsnamen of open bestanden. Met 'compact' wordt instructions.txt in het
+        compacte formaat geschreven (zie 'PicoEmitter'), website.json blijft een instructie per stap zodat de
+        route_index van het wagentje overeenkomt met het dashboard. Met 'greens' worden enkel die groene schijfjes
+        opgepikt (zie 'planScore'). Een route zonder stappen schrijft niets.
+        De functie geeft een dictionary terug met het aantal instructies en de grootte van beide bestanden (tekens).
+    """
+
+    if len(route) <= 1:
+        return {'instructions': 0, 'pico_size': 0, 'website_size': 0}
+
+    pico_file, pico_opened = open_help(instructions)
+    website_file, website_opened = open_help(website)
+    pico = PicoEmitter(pico_file, compact)
+    site = WebsiteEmitter(website_file, board)
+    count = compileRoute(route, board, [pico, site], start_direction, greens)
+    if pico_opened:
+        pico_file.close()
+    if website_opened:
+        website_file.close()
+    return {'instructions': count, 'pico_size': pico.size, 'website_size': site.size}
+
+###################################################################################################################
+############# KORTSTE PAD - Dijkstra/A* over (vak, rijrichting) ###################################################
+###################################################################################################################
+
+# De zoekruimte bestaat uit toestanden (vak, rijrichting). Een stap vooruit kost TIMESTRAIGHT, plus TIMETURN per
+# kwartslag als de richting verandert, exact zoals 'calculateTime' een route beoordeelt. Omdat alle kosten positief
+# zijn geeft Dijkstra de optimale route, zonder limiet op de lengte. De Manhattan-afstand maal TIMESTRAIGHT is een
+# toelaatbare en consistente heuristiek, dus A* blijft optimaal en bekijkt minder toestanden.
+#
+# Op grote, bijna lege borden zijn er heel veel even snelle routes (trappen met evenveel stappen). Daarom telt
+# 'headingSearch' ook de minimale draaitijd naar de finish mee (zie 'turnBounds'): dat is de exacte tijd op een bord
+# zonder obstakels en dus nog steeds consistent, maar elke trap met een extra bocht valt meteen af. Verder worden
+# rechte gangen in een stap doorlopen en doodlopende gangen overgeslagen (zie 'Board.corridorMoves'), en wordt er
+# nooit ter plaatse gekeerd behalve op de start: dat kan enkel terug naar het vorige vak, en die omweg is nooit sneller.
+# De klassieke jump point search schrapt buren op basis van de obstakels er vlak naast; met draaitijden is dat niet
+# meer exact, dus dat wordt hier niet gedaan.
+
+def turnTimes():
+    """
+        De functie geeft een tabel terug met turns[h][d] = draaitijd van rijrichting h naar rijrichting d.
+        Rijrichting 4 staat voor 'nog geen richting' (None), van daaruit is draaien gratis.
+    """
+
+    return [[turnTime(h, d) for d in range(4)] for h in range(4)] + [[0, 0, 0, 0]]
+
+def trace_help(board, parent, state):
+    """
+        hulpfunctie die een route terugvolgt in een parent-array van toestanden (index * 5 + rijrichting).
+    """
+
+    route = []
+    while state != -1:
+        route.append(board.position(state // 5))
+        state = parent[state]
+    route.reverse()
+    return route
+
+def turnBounds():
+    """
+        De functie geeft een tabel terug met bounds[sx + 1][sy + 1][h] = minimale draaitijd om vanuit rijrichting h
+        (4 = nog geen richting) een doel te bereiken dat in de richting (sx, sy) ligt (sx, sy in -1, 0, 1; sx > 0 is
+        naar beneden, sy > 0 naar rechts), op een bord zonder obstakels.
+    """
+
+    bounds = [[[0] * 5 for _ in range(3)] for _ in range(3)]
+    for sx in (-1, 0, 1):
+        for sy in (-1, 0, 1):
+            needed = ([0] if sx < 0 else [2] if sx > 0 else []) + ([3] if sy < 0 else [1] if sy > 0 else [])
+            for h in range(5):
+                if not needed:
+                    bound = 0
+                elif h == 4:
+                    bound = TIMETURN if len(needed) == 2 else 0
+                elif (h + 2) % 4 in needed:
+                    bound = 2 * TIMETURN # eerst keren
+                elif h in needed:
+                    bound = TIMETURN if len(needed) == 2 else 0
+                else:
+                    bound = TIMETURN
+                bounds[sx + 1][sy + 1][h] = bound
+    return bounds
+
+def trace_jump_help(board, parent, state):
+    """
+        hulpfunctie die een route terugvolgt in een parent-dictionary van toestanden (index * 5 + rijrichting), waarbij
+        twee opeenvolgende toestanden in een rechte lijn meerdere vakken uit elkaar kunnen liggen (zie 'corridorMoves').
+    """
+
+    route = [board.position(state // 5)]
+    while parent[state] != -1:
+        x, y = route[-1]
+        dx, dy = RICHTINGEN[state % 5]
+        state = parent[state]
+        px, py = board.position(state // 5)
+        while (x, y) != (px, py):
+            x -= dx
+            y -= dy
+            route.append((x, y))
+    route.reverse()
+    return route
+
+def headingSearch(board, start, finish, start_direction=None, stats=None):
+    """
+        De functie zoekt de snelste route van 'start' naar 'finish' over toestanden (vak, rijrichting) met A*.
+
+        'start_direction' is de rijrichting van het wagentje op de startpositie (0 = up, 1 = right, 2 = down, 3 = left).
+        Bij 'None' mag de eerste stap in elke richting zonder draaitijd, net zoals in 'calculateTime'.
+
+        De functie geeft een tupel (tijd, route, eindrichting) terug, of 'None' als 'finish' onbereikbaar is.
+        De eindrichting is 'None' als start en finish gelijk zijn en er dus niet gereden wordt.
+        Als 'stats' een dictionary is, wordt het aantal bekeken toestanden opgeteld bij "nodes".
+    """
+
+    if start == finish:
+        return 0, [start], start_direction
+
+    board = asBoard(board)
+    key = segmentKey(board, start, finish, start_direction)
+    cached = PATH_CACHE.get(key, NOT_FOUND)
+    if cached is not NOT_FOUND:
+        return cached
+
+    cols = board.cols
+    turns = turnTimes()
+    bounds = turnBounds()
+    fx, fy = finish
+    target = board.index(finish)
+
+    # toestand = index van het vak * 5 + rijrichting (4 = nog geen richting); enkel de bereikte toestanden worden
+    # bewaard, zodat een korte zoektocht op een groot bord niet eerst grote tabellen moet aanmaken
+    begin = board.index(start) * 5 + (4 if start_direction is None else start_direction)
+    best = {begin: 0}
+    parent = {begin: -1}
+    # bij gelijke schatting eerst de toestand die al het verst gereden heeft (-cost)
+    heap = [(0, 0, begin)]
+    expanded = 0
+    inf = float('inf')
+    corridors = board.corridors
+    best_get = best.get
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    while heap:
+        estimate, cost, state = heappop(heap)
+        cost = -cost
+        if cost > best[state]:
+            continue
+        # een rechte stap met dezelfde schatting is zelf een toestand met de kleinste schatting: die wordt meteen
+        # verder bekeken zonder langs de heap te gaan (zo springt de zoektocht over open stukken van het bord)
+        while True:
+            expanded += 1
+            i, direction = divmod(state, 5)
+            if i == target:
+                result = (cost, trace_jump_help(board, parent, state), direction)
+                PATH_CACHE.put(key, result)
+                if stats is not None:
+                    stats["nodes"] = stats.get("nodes", 0) + expanded
+                return result
+
+            turn = turns[direction]
+            back = (direction + 2) % 4 if state != begin else -1 # terugkeren is enkel op de start zinvol
+            x, y = divmod(i, cols)
+            following = None
+            for new_direction, j, steps, dead in corridors.get(i) or board.corridorMoves(i):
+                if new_direction == back:
+                    continue
+                if steps > 1 or dead:
+                    # stopt de finish in de gang?
+                    dx, dy = RICHTINGEN[new_direction]
+                    t = (fx - x) * dx + (fy - y) * dy
+                    if 0 < t <= steps and x + dx * t == fx and y + dy * t == fy:
+                        j = target
+                        steps = t
+                    elif dead:
+                        continue
+                new_cost = cost + TIMESTRAIGHT * steps + turn[new_direction]
+                new_state = j * 5 + new_direction
+                if new_cost < best_get(new_state, inf):
+                    best[new_state] = new_cost
+                    parent[new_state] = state
+                    nx, ny = divmod(j, cols)
+                    new_estimate = (new_cost + TIMESTRAIGHT * (abs(fx - nx) + abs(fy - ny))
+                                    + bounds[(fx > nx) - (fx < nx) + 1][(fy > ny) - (fy < ny) + 1][new_direction])
+                    if following is None and new_direction == direction and new_estimate <= estimate + 1e-9:
+                        following = (new_cost, new_state)
+                    else:
+                        heappush(heap, (new_estimate, -new_cost, new_state))
+            if following is None:
+                break
+            cost, state = following
+
+    PATH_CACHE.put(key, None)
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + expanded
+    return None
+
+def headingSearchAll(board, start, targets, start_direction=None, stats=None):
+    """
+        De functie zoekt met Dijkstra over (vak, rijrichting) vanuit 'start' de snelste route naar elk vak in 'targets'.
+        Het zoeken stopt zodra alle bereikbare doelen gevonden zijn.
+
+        De functie geeft een dictionary terug die elk bereikbaar doel afbeeldt op een tupel (tijd, route, eindrichting),
+        met dezelfde betekenis als bij 'headingSearch'. Onbereikbare doelen komen niet in de dictionary voor.
+        Als 'stats' een dictionary is, wordt het aantal bekeken toestanden opgeteld bij "nodes".
+    """
+
+    output = {}
+    remaining = set(targets)
+    if start in remaining:
+        output[start] = (0, [start], start_direction)
+        remaining.discard(start)
+
+    board = asBoard(board)
+    for target in list(remaining):
+        cached = segmentLookup(board, start, target, start_direction)
+        if cached is not NOT_FOUND:
+            if cached is not None:
+                output[target] = cached
+            remaining.discard(target)
+    if not remaining:
+        return output
+
+    searched = set(remaining)
+    moves = board.moves
+    turns = turnTimes()
+    remaining = {board.index(target) for target in remaining}
+
+    best = array.array('d', [float('inf')]) * (len(board.cells) * 5)
+    parent = array.array('l', [-1]) * (len(board.cells) * 5)
+    begin = board.index(start) * 5 + (4 if start_direction is None else start_direction)
+    best[begin] = 0
+    heap = [(0, begin)]
+    expanded = 0
+
+    while heap and remaining:
+        cost, state = heapq.heappop(heap)
+        if cost > best[state]:
+            continue
+        expanded += 1
+        i, direction = divmod(state, 5)
+        if i in remaining:
+            # het eerste bezoek aan een vak is het snelste, ongeacht de rijrichting
+            output[board.position(i)] = (cost, trace_help(board, parent, state), direction)
+            remaining.discard(i)
+
+        turn = turns[direction]
+        for new_direction, j in moves[i]:
+            # afronden: even snelle routes krijgen exact dezelfde tijd, zodat de keuze ertussen enkel van de volgorde
+            # van de toestanden afhangt (en niet van afrondingsfouten), zoals in 'segmentTableNumpy'
+            new_cost = round(cost + TIMESTRAIGHT + turn[new_direction], 9)
+            new_state = j * 5 + new_direction
+            if new_cost < best[new_state]:
+                best[new_state] = new_cost
+                parent[new_state] = state
+                heapq.heappush(heap, (new_cost, new_state))
+
+    for target in searched:
+        segmentStore(board, start, target, start_direction, output.get(target))
+    if stats is not None:
+        stats["nodes"] = stats.get("nodes", 0) + expanded
+    return output
+
+###################################################################################################################
+############# SEGMENTTABEL - alle deelroutes tussen start, finish en groene schijfjes ###########################
+###################################################################################################################
+
+# Een route die alle groene schijfjes oppikt is een aaneenschakeling van deelroutes (segmenten) tussen twee
+# opeenvolgende punten. In plaats van elk segment opnieuw te zoeken voor elke volgorde, worden alle segmenten
+# tussen start, finish en de groene schijfjes op voorhand berekend (een Dijkstra per vertrekpunt). Een volgorde
+# beoordelen is dan enkel nog opzoeken en optellen.
+
+def segmentTable(board, start, finish, greens, backend="python", stats=None):
+    """
+        De functie berekent de snelste deelroute tussen elk paar punten uit start, finish en 'greens'.
+
+        De functie geeft een dictionary terug die een paar (van, naar) afbeeldt op een tupel
+        (tijd, route, beginrichting, eindrichting). De begin- en eindrichting zijn de rijrichting van de eerste en
+        de laatste stap van de deelroute, die nodig zijn om de draaitijd tussen twee segmenten te berekenen.
+        Paren zonder geldige route komen niet in de tabel voor.
+
+        Met backend="numpy" worden alle afstanden in een keer berekend met 'segmentTableNumpy'.
+        Als 'stats' een dictionary is, worden daarin "nodes" (zie 'headingSearch') en "segments" bijgehouden.
+    """
+
+    if backend == "numpy":
+        table = segmentTableNumpy(board, start, finish, greens)
+        if stats is not None:
+            stats["segments"] = len(table)
+        return table
+    if backend != "python":
+        raise ValueError(f"!!! Error !!!: Onbekende backend '{backend}', kies uit ['numpy', 'python']")
+
+    table = {}
+    sources = [start] + [green for green in greens if green != start]
+    targets = set(greens)
+    targets.add(finish)
+
+    for source in sources:
+        if stats is not None:
+            progress_help("segments", stats)
+        for target, (cost, route, last_direction) in headingSearchAll(board, source, targets, None, stats).items():
+            if target == source:
+                continue
+            first_direction = RICHTINGEN.index((route[1][0] - route[0][0], route[1][1] - route[0][1]))
+            table[(source, target)] = (cost, route, first_direction, last_direction)
+
+    if stats is not None:
+        stats["segments"] = len(table)
+    return table
+
+def numpy_help():
+    """
+        laadt NumPy pas bij de eerste segmenttabel met backend="numpy", zodat 'import kortsteRoute' (ook in elk proces
+        van planBatch en tourParallel) er niet op wacht, en geeft de module terug.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("!!! Error !!!: NumPy is niet geinstalleerd, gebruik backend='python'") from None
+    return numpy
+
+def straight_help(depart, free):
+    """
+        hulpfunctie voor 'distanceFieldsNumpy': snelste aankomsttijd door rechtdoor te rijden langs de laatste as
+        (naar hogere index), vertrekkend vanuit eender welk vak op dezelfde lijn zonder rood schijfje ertussen.
+        Werkt met verdubbelende sprongen (1, 2, 4, ... vakken), dus in log(lengte) stappen.
+    """
+
+    numpy = numpy_help()
+    arrive = numpy.full_like(depart, numpy.inf)
+    arrive[..., 1:] = depart[..., :-1] + TIMESTRAIGHT
+    arrive[..., ~free] = numpy.inf
+    clear = free.copy() # clear[x, y]: alle vakken van y - step + 1 tot en met y zijn vrij
+    step = 1
+    while step < free.shape[-1]:
+        # aankomen op y via y - step, als alle vakken daartussen vrij zijn
+        shifted = arrive[..., :-step] + step * TIMESTRAIGHT
+        shifted[..., ~clear[:, step:]] = numpy.inf
+        numpy.minimum(arrive[..., step:], shifted, out=arrive[..., step:])
+        clear[:, step:] &= clear[:, :-step].copy()
+        clear[:, :step] = False
+        step *= 2
+    return arrive
+
+def distanceFieldsNumpy(board, sources):
+    """
+        De functie berekent met NumPy voor alle vertrekpunten in 'sources' tegelijk de snelste tijd om elk vak te
+        bereiken met elke rijrichting. Het resultaat is een array met vorm (len(sources), 4, rijen, kolommen);
+        onbereikbare toestanden hebben tijd inf. Op een vertrekpunt is de rijrichting vrij (tijd 0 in alle richtingen).
+
+        Alle afstanden worden samen bijgewerkt als een golffront: per ronde wordt vanuit elke toestand eerst
+        gedraaid en dan zo ver als mogelijk rechtdoor gereden (in alle vier de richtingen tegelijk), tot er niets meer
+        verandert. Het aantal rondes is dus het aantal bochten in de langste snelste route, niet haar lengte.
+    """
+
+    numpy = numpy_help()
+    board = asBoard(board)
+    inf = numpy.inf
+    free = numpy.frombuffer(bytes(board.cells), dtype=numpy.uint8).reshape(board.rows, board.cols) != ord("R")
+
+    dist = numpy.full((len(sources), 4, board.rows, board.cols), inf)
+    for s, (x, y) in enumerate(sources):
+        dist[s, :, x, y] = 0
+
+    while True:
+        # beste tijd om een vak te verlaten in rijrichting d (vorm (S, 4, rijen, kolommen)): rechtdoor, een
+        # kwartslag vanuit een van de twee buurrichtingen, of een halve draai
+        depart = numpy.minimum(dist, numpy.minimum(numpy.roll(dist, 1, axis=1), numpy.roll(dist, -1, axis=1)) + TIMETURN)
+        numpy.minimum(depart, numpy.roll(dist, 2, axis=1) + 2 * TIMETURN, out=depart)
+        arrive = numpy.empty_like(dist)
+        # elke richting herleiden tot 'naar rechts' door te spiegelen en/of rijen en kolommen te wisselen
+        arrive[:, 1] = straight_help(depart[:, 1], free)
+        arrive[:, 3] = straight_help(depart[:, 3, :, ::-1], free[:, ::-1])[:, :, ::-1]
+        arrive[:, 2] = straight_help(depart[:, 2].swapaxes(1, 2), free.T).swapaxes(1, 2)
+        arrive[:, 0] = straight_help(depart[:, 0, ::-1, :].swapaxes(1, 2), free[::-1, :].T).swapaxes(1, 2)[:, ::-1, :]
+        improved = arrive < dist - 1e-9
+        if not improved.any():
+            return dist
+        dist = numpy.where(improved, arrive, dist)
+
+def segmentTableNumpy(board, start, finish, greens):
+    """
+        Zelfde resultaat als 'segmentTable', maar alle afstanden vanuit start en de groene schijfjes worden in een
+        keer berekend met 'distanceFieldsNumpy'. De routes worden daarna teruggevolgd in de afstandsvelden, met
+        dezelfde keuze tussen even snelle routes als 'headingSearchAll', zodat ook de begin- en eindrichtingen (en
+        dus de draaitijden tussen de segmenten) dezelfde zijn als met de Python-versie.
+    """
+
+    board = asBoard(board)
+    sources = [start] + [green for green in greens if green != start]
+    targets = set(greens)
+    targets.add(finish)
+    dist = distanceFieldsNumpy(board, sources).tolist()
+    turns = turnTimes()
+
+    table = {}
+    for s, source in enumerate(sources):
+        field = dist[s]
+        for target in targets:
+            if target == source:
+                continue
+            x, y = target
+            arrival = [field[h][x][y] for h in range(4)]
+            cost = min(arrival)
+            if cost == float('inf'):
+                continue
+            # zelfde keuze als 'headingSearchAll' bij gelijke tijden: de kleinste rijrichting bij aankomst, en als
+            # vorige toestand de snelst bereikte (die Dijkstra eerst bekijkt), daarna de kleinste rijrichting
+            direction = next(h for h in range(4) if arrival[h] <= cost + 1e-9)
+            last_direction = direction
+            route = [target]
+            while (x, y) != source:
+                # het vorige vak ligt achter het wagentje, zoek de rijrichting daar die deze tijd verklaart
+                dx, dy = RICHTINGEN[direction]
+                x, y = x - dx, y - dy
+                wanted = field[direction][x + dx][y + dy] - TIMESTRAIGHT
+                candidates = [h for h in range(4) if abs(field[h][x][y] + turns[h][direction] - wanted) <= 1e-9]
+                if not candidates: # afrondingsfouten: de beste benadering
+                    candidates = [min(range(4), key=lambda h: abs(field[h][x][y] + turns[h][direction] - wanted))]
+                earliest = min(field[h][x][y] for h in candidates)
+                direction = next(h for h in candidates if field[h][x][y] <= earliest + 1e-9)
+                route.append((x, y))
+            route.reverse()
+            first_direction = RICHTINGEN.index((route[1][0] - route[0][0], route[1][1] - route[0][1]))
+            table[(source, target)] = (cost, route, first_direction, last_direction)
+
+    return table
+
+def tourTime(table, path, start_direction=None):
+    """
+        De functie berekent de tijd van de route die de punten uit 'path' in volgorde aandoet, enkel met opzoekingen
+        in de segmenttabel. Het resultaat is gelijk aan 'calculateTime' van de samengestelde route, dus inclusief
+        de draaitijden op de tussenliggende punten. Met 'start_direction' telt ook de draai op de start mee.
+
+        De functie geeft 'None' terug als een segment uit 'path' niet in de tabel staat (onbereikbaar).
+    """
+
+    output = 0
+    direction = start_direction
+    for i in range(len(path) - 1):
+        if path[i] == path[i + 1]:
+            continue
+        segment = table.get((path[i], path[i + 1]))
+        if segment is None:
+            return None
+        output += turnTime(direction, segment[2]) + segment[0]
+        direction = segment[3]
+
+    return output
+
+def tourRoute(table, path):
+    """
+        De functie plakt de segmenten uit de segmenttabel voor de punten uit 'path' aan elkaar tot een volledige route.
+    """
+
+    route = [path[0]]
+    for i in range(len(path) - 1):
+        if path[i] != path[i + 1]:
+            route.extend(table[(path[i], path[i + 1])][1][1:])
+
+    return route
+
+###################################################################################################################
+############# VOLGORDE - in welke volgorde de groene schijfjes oppikken ###########################################
+###################################################################################################################
+
+# Elke tour-solver krijgt de segmenttabel, start, finish en de lijst groene schijfjes, en geeft een tupel
+# (tijd, path) terug met path = [start] + volgorde + [finish] en tijd = tourTime(table, path).
+# Als er geen geldige volgorde bestaat (een groen schijfje is onbereikbaar) is dat (float('inf'), None).
+
+def tourPermutations(table, start, finish, greens, stats=None, on_improve=None):
+    """
+        Tour-solver die alle volgordes van de groene schijfjes een voor een probeert (O(n!)).
+        De volgordes worden een voor een gegenereerd, er wordt nooit een lijst van alle permutaties opgebouwd.
+        Als 'stats' een dictionary is, wordt daarin het aantal beoordeelde volgordes ("evaluated") bijgehouden.
+        Elke keer dat een betere volgorde gevonden wordt, wordt 'on_improve(tijd, path)' opgeroepen (indien gegeven).
+    """
+
+    if stats is None:
+        stats = {}
+    stats["evaluated"] = 0
+    stats["total"] = math.factorial(len(greens))
+
+    shortest_path = None
+    shortest_length = float('inf')
+
+    for index, perm in enumerate(itertools.permutations(greens), 1):
+        if index % 1024 == 0:
+            stats["evaluated"] = index
+            progress_help("permutations", stats) # om progress bij te houden
+
+        path = [start] + list(perm) + [finish]
+        time = tourTime(table, path)
+        if time is None:
+            continue
+        if time < shortest_length:
+            shortest_length = time
+            shortest_path = path
+            if on_improve is not None:
+                on_improve(time, path)
+
+    stats["evaluated"] = stats["total"]
+    return shortest_length, shortest_path
+
+def tourHeldKarp(table, start, finish, greens, stats=None):
+    """
+        Tour-solver met dynamisch programmeren (Held-Karp) over (bezochte groene schijfjes, laatste groene schijfje,
+        rijrichting bij aankomst). De rijrichting is nodig omdat de draaitijd op een groen schijfje afhangt van het
+        vorige segment. De oplossing is dezelfde als die van 'tourPermutations', in O(n^2 * 2^n) tijd.
+        Als 'stats' een dictionary is, wordt daarin het aantal bereikbare DP-toestanden ("evaluated") bijgehouden.
+
+        De tabellen nemen 2^n * (aantal toestanden) * 10 bytes in, met enkel de bereikbare rijrichtingen per schijfje
+        (zie 'heldKarp_help', meestal een drietal): bij 16 groene schijfjes ongeveer 30 MB en 10 seconden, elk extra
+        schijfje verdubbelt beide (20 schijfjes: ongeveer 0,5 GB en enkele minuten). Gebruik daarboven "heuristic".
+    """
+
+    if stats is None:
+        stats = {}
+    stats["evaluated"] = 0
+
+    n = len(greens)
+    if n == 0:
+        path = [start, finish]
+        time = tourTime(table, path)
+        return (float('inf'), None) if time is None else (time, path)
+
+    cost, parent, states = heldKarp_help(table, start, greens, stats)
+    full = (1 << n) - 1
+    best, best_state = heldKarpEnd_help(table, finish, greens, cost, states, full)
+    if best_state is None:
+        return float('inf'), None
+
+    path = [start] + heldKarpOrder_help(greens, parent, states, full, best_state) + [finish]
+    return tourTime(table, path), path
+
+def heldKarp_help(table, start, greens, stats, start_direction=None):
+    """
+        vult de Held-Karp-tabellen voor 'tourHeldKarp' in en geeft (cost, parent, states) terug. De tabellen bevatten
+        de snelste tijd voor elke deelverzameling van 'greens', zodat 'heldKarpEnd_help' de beste tour naar de finish
+        voor elke deelverzameling kan geven (zie ook 'planFleet'). Met 'start_direction' telt de draai op de start mee.
+    """
+
+    n = len(greens)
+    inf = float('inf')
+    full = (1 << n) - 1
+    # rijrichting 4 betekent 'nog geen richting' (enkel als alle vorige segmenten leeg zijn, bv. groen op de start)
+    turns = [[turnTime(h, d) for d in range(4)] for h in range(4)] + [[0, 0, 0, 0]]
+    segments = [[table.get((a, b)) for b in greens] for a in greens]
+
+    # Op schijfje j kom je enkel aan met de laatste rijrichting van een segment naar j (of de rijrichting op de start
+    # als j op de start ligt), dus meestal met 1 tot 3 van de 5 rijrichtingen. Enkel die toestanden krijgen een plaats:
+    # toestand s = (j, h) staat in states[s], groups[j] bevat de paren (s, h) van schijfje j, gesorteerd op h.
+    headings = [set() for _ in greens]
+    for j, green in enumerate(greens):
+        if green == start:
+            headings[j].add(4 if start_direction is None else start_direction)
+        elif table.get((start, green)) is not None:
+            headings[j].add(table[(start, green)][3])
+        for i in range(n):
+            if i != j and segments[i][j] is not None:
+                headings[j].add(segments[i][j][3])
+    states = []
+    groups = []
+    slot = []
+    for j in range(n):
+        groups.append([(len(states) + i, h) for i, h in enumerate(sorted(headings[j]))])
+        slot.append({h: s for s, h in groups[j]})
+        states.extend((j, h) for h in sorted(headings[j]))
+    m = len(states)
+
+    # cost[mask * m + s]: snelste tijd om de groene schijfjes uit 'mask' te bezoeken en te eindigen in toestand s.
+    # parent bevat de vorige toestand, of -1 voor de start.
+    cost = array.array('d', [inf]) * ((full + 1) * m)
+    parent = array.array('h', [-1]) * ((full + 1) * m)
+
+    for j, green in enumerate(greens):
+        if green == start:
+            cost[(1 << j) * m + slot[j][4 if start_direction is None else start_direction]] = 0
+            continue
+        segment = table.get((start, green))
+        if segment is not None:
+            cost[(1 << j) * m + slot[j][segment[3]]] = turnTime(start_direction, segment[2]) + segment[0]
+
+    evaluated = 0
+    for mask in range(1, full + 1):
+        if not mask & 1023:
+            stats["evaluated"] = evaluated
+            progress_help("heldkarp", stats)
+        base = mask * m
+        for j in range(n):
+            if not mask & (1 << j):
+                continue
+            arrival = [(cost[base + s], s, h) for s, h in groups[j]]
+            if min(arrival, default=(inf,))[0] == inf:
+                continue
+            evaluated += 1
+            # beste vertrektijd per nieuwe rijrichting d, samen met de toestand bij aankomst die daarvoor gebruikt wordt
+            departure = []
+            for d in range(4):
+                best = inf
+                best_s = -1
+                for time, s, h in arrival:
+                    if time + turns[h][d] < best:
+                        best = time + turns[h][d]
+                        best_s = s
+                departure.append((best, best_s))
+            for k in range(n):
+                if mask & (1 << k):
+                    continue
+                segment = segments[j][k]
+                if segment is None:
+                    continue
+                new_cost, came_from = departure[segment[2]]
+                new_cost += segment[0]
+                index = (mask | (1 << k)) * m + slot[k][segment[3]]
+                if new_cost < cost[index]:
+                    cost[index] = new_cost
+                    parent[index] = came_from
+
+    stats["evaluated"] = evaluated
+    return cost, parent, (states, groups, turns)
+
+def heldKarpEnd_help(table, finish, greens, cost, states, mask):
+    """
+        geeft (tijd, toestand) terug van de snelste tour over de groene schijfjes uit 'mask' tot aan de finish, met
+        'states' zoals 'heldKarp_help' het teruggeeft, of (inf, None) als die tour niet bestaat.
+    """
+
+    states, groups, turns = states
+    base = mask * len(states)
+    best = float('inf')
+    best_state = None
+    for j, green in enumerate(greens):
+        if not mask & (1 << j):
+            continue
+        segment = table.get((green, finish))
+        for s, h in groups[j]:
+            if green == finish:
+                time = cost[base + s]
+            elif segment is None:
+                continue
+            else:
+                time = cost[base + s] + turns[h][segment[2]] + segment[0]
+            if time < best:
+                best = time
+                best_state = s
+    return best, best_state
+
+def heldKarpOrder_help(greens, parent, states, mask, best_state):
+    """
+        geeft de volgorde van de groene schijfjes terug die eindigt in 'best_state' (zie 'heldKarpEnd_help').
+    """
+
+    states = states[0]
+    order = []
+    while best_state != -1:
+        j = states[best_state][0]
+        order.append(greens[j])
+        previous = parent[mask * len(states) + best_state]
+        mask &= ~(1 << j)
+        best_state = previous
+    order.reverse()
+    return order
+
+def tourBranchAndBound(table, start, finish, greens, stats=None, prefix=(), shared_bound=None, on_improve=None):
+    """
+        Exacte tour-solver met branch-and-bound: de volgorde wordt diepte-eerst verlengd, goedkoopste segment eerst.
+        Een begin van een volgorde wordt geschrapt als de tijd tot nu toe plus een ondergrens voor de rest al niet
+        beter is dan de beste volledige volgorde tot nu toe.
+
+        De ondergrens telt voor elk nog niet bezocht groen schijfje het goedkoopste segment dat er naartoe leidt
+        vanaf de huidige positie of een ander nog niet bezocht schijfje, plus het goedkoopste segment naar de finish
+        (draaitijden niet meegerekend). Dat is nooit meer dan de echte resterende tijd, dus het optimum blijft behouden.
+
+        Als 'stats' een dictionary is, worden daarin de tellers "expanded" (bekeken begin-volgordes) en "pruned"
+        (geschrapte begin-volgordes) bijgehouden.
+
+        Met 'prefix' worden enkel volgordes bekeken die met die groene schijfjes beginnen. 'shared_bound' is een
+        gedeelde multiprocessing.Value met de beste tijd van alle processen samen (zie 'tourParallel'). Daartegen
+        wordt enkel geschrapt als het strikt slechter is, zodat het resultaat niet afhangt van de timing.
+
+        Elke keer dat een betere volgorde gevonden wordt, wordt 'on_improve(tijd, path)' opgeroepen (indien gegeven).
+    """
+
+    if stats is None:
+        stats = {}
+    stats["expanded"] = 0
+    stats["pruned"] = 0
+
+    inf = float('inf')
+    n = len(greens)
+    points = greens + [start] # index n is de start
+
+    def step(a, direction, b):
+        # tijd en nieuwe rijrichting om van a naar b te rijden, of None als dat niet kan
+        if a == b:
+            return 0, direction
+        segment = table.get((a, b))
+        if segment is None:
+            return None
+        return turnTime(direction, segment[2]) + segment[0], segment[3]
+
+    def segment_cost(a, b):
+        if a == b:
+            return 0
+        segment = table.get((a, b))
+        return inf if segment is None else segment[0]
+
+    costs = [[segment_cost(a, b) for b in greens] for a in points]
+    finish_costs = [segment_cost(a, finish) for a in points]
+
+    best = [inf, None]
+    order = []
+    visited = [False] * n
+
+    def lower_bound(p):
+        remaining = [k for k in range(n) if not visited[k]]
+        if not remaining:
+            return finish_costs[p]
+        total = min(finish_costs[a] for a in remaining)
+        for g in remaining:
+            total += min([costs[a][g] for a in remaining if a != g] + [costs[p][g]])
+        return total
+
+    def search(p, direction, cost):
+        bound = cost + lower_bound(p)
+        if bound >= best[0] or (shared_bound is not None and bound > shared_bound.value):
+            stats["pruned"] += 1
+            return
+        stats["expanded"] += 1
+        if not stats["expanded"] & 4095:
+            progress_help("branchbound", stats)
+        if len(order) == n:
+            result = step(points[p], direction, finish)
+            if result is not None and cost + result[0] < best[0]:
+                best[0] = cost + result[0]
+                best[1] = [start] + order + [finish]
+                if on_improve is not None:
+                    on_improve(best[0], list(best[1]))
+                if shared_bound is not None:
+                    with shared_bound.get_lock():
+                        shared_bound.value = min(shared_bound.value, best[0])
+            return
+
+        children = []
+        for k in range(n):
+            if not visited[k]:
+                result = step(points[p], direction, greens[k])
+                if result is not None:
+                    children.append((result[0], k, result[1]))
+        children.sort()
+
+        for step_cost, k, new_direction in children:
+            visited[k] = True
+            order.append(greens[k])
+            search(k, new_direction, cost + step_cost)
+            order.pop()
+            visited[k] = False
+
+    p = n
+    direction = None
+    cost = 0
+    for green in prefix:
+        k = greens.index(green)
+        result = step(points[p], direction, green)
+        if result is None:
+            return inf, None
+        cost += result[0]
+        direction = result[1]
+        visited[k] = True
+        order.append(green)
+        p = k
+
+    search(p, direction, cost)
+
+    if best[1] is None:
+        return inf, None
+    return tourTime(table, best[1]), best[1]
+
+def tourHeuristic(table, start, finish, greens, time_budget=1.0, on_improve=None, seed=0, stats=None):
+    """
+        Heuristische tour-solver voor veel groene schijfjes, met een vaste rekentijd 'time_budget' (seconden).
+
+        Eerst wordt een volgorde gemaakt door telkens naar het dichtstbijzijnde (snelste) nog niet bezochte schijfje te
+        rijden. Die volgorde wordt verbeterd met 2-opt (een stuk van de volgorde omkeren) en Or-opt (een blokje van 1
+        tot 3 schijfjes verplaatsen) tot er geen verbetering meer is. Met de resterende tijd wordt de beste volgorde
+        willekeurig verstoord en opnieuw verbeterd. Het resultaat is niet gegarandeerd optimaal.
+
+        Elke keer dat een betere volgorde gevonden wordt, wordt 'on_improve(tijd, path)' opgeroepen (indien gegeven).
+        Als 'stats' een dictionary is, wordt daarin het aantal beoordeelde volgordes ("evaluated") bijgehouden.
+    """
+
+    if stats is None:
+        stats = {}
+    stats["evaluated"] = 0
+
+    inf = float('inf')
+    deadline = time.perf_counter() + time_budget
+    rng = random.Random(seed)
+
+    def evaluate(order):
+        stats["evaluated"] += 1
+        if not stats["evaluated"] & 1023:
+            progress_help("heuristic", stats)
+        result = tourTime(table, [start] + order + [finish])
+        return inf if result is None else result
+
+    # dichtstbijzijnde buur
+    order = []
+    remaining = list(greens)
+    point = start
+    direction = None
+    while remaining:
+        candidates = []
+        for green in remaining:
+            if green == point:
+                candidates.append((0, green, direction))
+            elif (point, green) in table:
+                segment = table[(point, green)]
+                candidates.append((turnTime(direction, segment[2]) + segment[0], green, segment[3]))
+        if not candidates:
+            return inf, None
+        _, point, direction = min(candidates)
+        order.append(point)
+        remaining.remove(point)
+
+    best_order = order
+    best = evaluate(order)
+    if best == inf:
+        return inf, None
+    if on_improve is not None:
+        on_improve(best, [start] + best_order + [finish])
+
+    def neighbours(order):
+        n = len(order)
+        for i in range(n - 1):
+            for j in range(i + 2, n + 1):
+                yield order[:i] + order[i:j][::-1] + order[j:]
+        for length in (1, 2, 3):
+            for i in range(n - length + 1):
+                block = order[i:i + length]
+                rest = order[:i] + order[i + length:]
+                for j in range(len(rest) + 1):
+                    if j != i:
+                        yield rest[:j] + block + rest[j:]
+
+    def improve(order, cost):
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            for candidate in neighbours(order):
+                candidate_cost = evaluate(candidate)
+                if candidate_cost < cost - 1e-9:
+                    order, cost = candidate, candidate_cost
+                    improved = True
+                    break
+                if time.perf_counter() >= deadline:
+                    break
+        return order, cost
+
+    while time.perf_counter() < deadline:
+        order, cost = improve(order, evaluate(order))
+        if cost < best - 1e-9:
+            best_order, best = order, cost
+            if on_improve is not None:
+                on_improve(best, [start] + best_order + [finish])
+        if len(best_order) < 4:
+            break # te weinig schijfjes om te verstoren, de lokale zoektocht heeft alles al bekeken
+        # verstoren: twee willekeurige stukken van de beste volgorde van plaats wisselen
+        i, j, k = sorted(rng.sample(range(1, len(best_order)), 3))
+        order = best_order[:i] + best_order[j:k] + best_order[i:j] + best_order[k:]
+
+    path = [start] + best_order + [finish]
+    return tourTime(table, path), path
+
+def parallel_init_help(table, start, finish, greens, shared_bound):
+    """
+        initializer voor de processen van 'tourParallel': bewaart het probleem eenmalig per proces.
+    """
+
+    global parallel_problem
+    parallel_problem = (table, start, finish, greens, shared_bound)
+
+def parallel_solve_help(prefix):
+    """
+        taak voor de processen van 'tourParallel': branch-and-bound voor alle volgordes die met 'prefix' beginnen.
+    """
+
+    table, start, finish, greens, shared_bound = parallel_problem
+    stats = {}
+    time, path = tourBranchAndBound(table, start, finish, greens, stats, prefix, shared_bound)
+    return time, path, stats
+
+def tourParallel(table, start, finish, greens, workers=None, stats=None):
+    """
+        Exacte tour-solver die 'tourBranchAndBound' verdeelt over meerdere processen (ProcessPoolExecutor).
+
+        De zoekruimte wordt opgesplitst in taken volgens de eerste groene schijfjes van de volgorde (zoveel dat er
+        minstens 4 taken per proces zijn). Alle processen delen de beste tijd tot nu toe, zodat een proces ook schrapt
+        met de oplossingen van de andere. De resultaten worden samengevoegd op (tijd, volgnummer van de taak), dus bij
+        gelijke tijden is het resultaat altijd hetzelfde, hoeveel processen er ook zijn.
+
+        'workers' is het aantal processen (standaard het aantal processorkernen). Als 'stats' een dictionary is,
+        worden daarin de opgetelde tellers van alle taken en het aantal taken ("tasks") bijgehouden.
+    """
+
+    if stats is None:
+        stats = {}
+    stats["expanded"] = 0
+    stats["pruned"] = 0
+    stats["tasks"] = 0
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if len(greens) < 2 or workers < 2:
+        return tourBranchAndBound(table, start, finish, greens, stats)
+
+    prefixes = [()]
+    while len(prefixes) < 4 * workers and len(prefixes[0]) < len(greens) - 1:
+        prefixes = [prefix + (green,) for prefix in prefixes for green in greens if green not in prefix]
+    stats["tasks"] = len(prefixes)
+
+    # een eerste bovengrens met de dichtstbijzijnde-buur-volgorde, zodat er van in het begin geschrapt kan worden
+    shared_bound = multiprocessing.Value('d', tourHeuristic(table, start, finish, greens, time_budget=0)[0])
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=parallel_init_help,
+                                                initargs=(table, start, finish, greens, shared_bound)) as executor:
+        results = list(executor.map(parallel_solve_help, prefixes))
+
+    best = (float('inf'), None)
+    for time, path, task_stats in results:
+        stats["expanded"] += task_stats["expanded"]
+        stats["pruned"] += task_stats["pruned"]
+        if path is not None and time < best[0]:
+            best = (time, path)
+
+    return best
+
+TOUR_SOLVERS = {
+    "permutations": tourPermutations,
+    "heldkarp": tourHeldKarp,
+    "branchbound": tourBranchAndBound,
+    "heuristic": tourHeuristic,
+    "parallel": tourParallel,
+}
+PROGRESSIVE_SOLVERS = {"permutations", "branchbound", "heuristic"} # tour-solvers met een 'on_improve'-parameter
+
+###################################################################################################################
+############# EXACT - snelste route over (vak, rijrichting, opgepikte groene schijfjes) ##########################
+###################################################################################################################
+
+# De segment-aanpak hierboven kiest elke deelroute los van de andere, waardoor draaitijden op de groene schijfjes
+# niet mee bepalen welke deelroute gekozen wordt. Hier wordt rechtstreeks gezocht over toestanden
+# (vak, rijrichting, verzameling opgepikte groene schijfjes), met exact de kosten van de instructies die
+# 'makeInstructionfile2' genereert: F kost TIMESTRAIGHT, L en R kosten TIMETURN en T180 kost 2 * TIMETURN.
+# Een groen schijfje wordt opgepikt (P, TIMEPICKUP) de eerste keer dat de route op zijn vak rijdt. Omdat elk schijfje
+# precies een keer opgepikt wordt, is de totale oppaktijd een constante die bij het resultaat opgeteld wordt.
+
+def distanceSteps(board, source):
+    """
+        De functie geeft een lijst terug met voor elk vak (op index board.index(pos)) het minimaal aantal stappen vanaf
+        'source', of -1 als het vak onbereikbaar is (breedte-eerst zoeken, zonder rekening te houden met draaien).
+    """
+
+    board = asBoard(board)
+    output = [-1] * len(board.cells)
+    output[board.index(source)] = 0
+    frontier = [board.index(source)]
+    while frontier:
+        next_frontier = []
+        for i in frontier:
+            for _, j in board.moves[i]:
+                if output[j] == -1:
+                    output[j] = output[i] + 1
+                    next_frontier.append(j)
+        frontier = next_frontier
+
+    return output
+
+def collectExact(board, start, finish, start_direction=None, stats=None):
+    """
+        De functie geeft de exact snelste route terug van 'start' naar 'finish' die alle groene schijfjes oppikt,
+        inclusief de draaitijden op de groene schijfjes zelf. Er wordt gezocht met A* over
+        (vak, rijrichting, opgepikte groene schijfjes). Een toestand wordt geschrapt als er op hetzelfde vak met
+        dezelfde rijrichting al een toestand is met minstens dezelfde opgepikte schijfjes en niet meer tijd.
+
+        'start_direction' is de rijrichting op de start (zoals bij 'makeInstructionfile2'), bij 'None' is de eerste
+        stap gratis in elke richting, zoals in 'calculateTime'. Een groen schijfje op de start wordt, net zoals in de
+        instructies, pas opgepikt als de route er opnieuw op rijdt.
+
+        De functie geeft een tupel (tijd, route) terug, waarbij de tijd de oppaktijd bevat. Als niet alle groene
+        schijfjes bereikbaar zijn is dat (float('inf'), None). Als 'stats' een dictionary is, worden daarin de
+        tellers "expanded" (bekeken toestanden) en "pruned" (gedomineerde toestanden) bijgehouden.
+    """
+
+    if stats is None:
+        stats = {}
+    stats["expanded"] = 0
+    stats["pruned"] = 0
+
+    inf = float('inf')
+    board = asBoard(board)
+    moves = board.moves
+    cells = len(board.cells)
+    turns = turnTimes()
+    greens = [board.index(green) for green in sorted(board.greens)]
+    bits = {green: 1 << k for k, green in enumerate(greens)}
+    full = (1 << len(greens)) - 1
+    pickups = len(greens) * TIMEPICKUP
+    begin_index = board.index(start)
+    target = board.index(finish)
+
+    # ondergrens: eerst het verste nog niet opgepikte schijfje, dan de finish (consistent, dus A* blijft optimaal)
+    to_finish = distanceSteps(board, finish)
+    to_green = [distanceSteps(board, board.position(green)) for green in greens]
+    if to_finish[begin_index] == -1 or any(to_finish[green] == -1 for green in greens):
+        return inf, None
+
+    def estimate(i, mask):
+        steps = to_finish[i]
+        for k, green in enumerate(greens):
+            if not mask & (1 << k):
+                steps = max(steps, to_green[k][i] + to_finish[green])
+        return TIMESTRAIGHT * steps
+
+    # toestand = (mask * aantal vakken + index van het vak) * 5 + rijrichting (4 = nog geen richting)
+    begin = begin_index * 5 + (4 if start_direction is None else start_direction)
+    best = {begin: 0}
+    parent = {begin: -1}
+    labels = {begin: [(0, 0)]} # per (vak, rijrichting): lijst van (mask, tijd)
+    heap = [(estimate(begin_index, 0), 0, begin)]
+
+    while heap:
+        _, cost, state = heapq.heappop(heap)
+        cost = -cost
+        if cost > best[state]:
+            continue
+        stats["expanded"] += 1
+        if not stats["expanded"] & 4095:
+            progress_help("exact", stats)
+        rest, direction = divmod(state, 5)
+        mask, i = divmod(rest, cells)
+        if i == target and mask == full:
+            route = []
+            while state != -1:
+                route.append(board.position(state // 5 % cells))
+                state = parent[state]
+            route.reverse()
+            return cost + pickups, route
+
+        turn = turns[direction]
+        for new_direction, j in moves[i]:
+            new_mask = mask | bits.get(j, 0)
+            new_cost = cost + TIMESTRAIGHT + turn[new_direction]
+            new_state = (new_mask * cells + j) * 5 + new_direction
+            if new_cost >= best.get(new_state, inf):
+                continue
+            others = labels.setdefault(j * 5 + new_direction, [])
+            if any(other_mask & new_mask == new_mask and other_cost <= new_cost for other_mask, other_cost in others):
+                stats["pruned"] += 1
+                continue
+            others.append((new_mask, new_cost))
+            best[new_state] = new_cost
+            parent[new_state] = state
+            heapq.heappush(heap, (new_cost + estimate(j, new_mask), -new_cost, new_state))
+
+    return inf, None
+
+###################################################################################################################
+############# HERPLANNEN - nieuwe obstakels tijdens het rijden ####################################################
+###################################################################################################################
+
+# Als het wagentje onderweg een nieuw obstakel ontdekt, hoeft niet alles opnieuw berekend te worden. Een extra
+# obstakel kan routes enkel trager maken, dus een segment uit de segmenttabel dat niet over het geblokkeerde vak
+# loopt blijft de snelste route. Enkel de segmenten die over het vak liepen worden opnieuw gezocht (zoals D* Lite
+# enkel het aangetaste deel van de zoektocht herstelt), samen met de segmenten vanaf de huidige positie.
+
+class Replanner:
+    """
+        Houdt het bord en de segmenttabel bij tussen opeenvolgende herplanningen tijdens een rit.
+
+        Gebruik: planner = Replanner(board, start, finish) bij het begin van de rit, en daarna
+        planner.replan(current, heading, collected, blocked) telkens als er een vak geblokkeerd blijkt.
+        Het bord van de oproeper wordt niet aangepast.
+    """
+
+    __slots__ = ("board", "finish", "table", "method", "recomputed")
+
+    def __init__(self, board, start, finish, method="heldkarp"):
+        self.board = asBoard(board).copy()
+        self.finish = finish
+        self.method = method
+        self.table = segmentTable(self.board, start, finish, sorted(self.board.greens))
+        self.recomputed = 0 # aantal segmenten dat bij de laatste herplanning opnieuw gezocht werd
+
+    def block(self, blocked, stats=None):
+        """
+            Markeert het vak 'blocked' als rood en herstelt enkel de segmenten die over dat vak liepen.
+            Als 'stats' een dictionary is, wordt het aantal bekeken toestanden opgeteld bij "nodes".
+        """
+
+        if self.board.get(*blocked) == "R":
+            return
+        self.board.set(blocked[0], blocked[1], "R")
+
+        affected = {}
+        for (source, target), segment in list(self.table.items()):
+            if source == blocked or target == blocked:
+                del self.table[(source, target)]
+            elif blocked in segment[1]:
+                del self.table[(source, target)]
+                affected.setdefault(source, set()).add(target)
+
+        for source, targets in affected.items():
+            found = headingSearchAll(self.board, source, targets, None, stats)
+            for target, (cost, route, last_direction) in found.items():
+                first_direction = RICHTINGEN.index((route[1][0] - route[0][0], route[1][1] - route[0][1]))
+                self.table[(source, target)] = (cost, route, first_direction, last_direction)
+            self.recomputed += len(targets)
+
+    def replan(self, current, heading, collected, blocked=None, stats=None):
+        """
+            De functie geeft de snelste resterende route terug vanaf 'current', met rijrichting 'heading', langs alle
+            groene schijfjes die niet in 'collected' zitten en dan naar de finish. Als 'blocked' gegeven is, wordt
+            dat vak eerst als obstakel toegevoegd (een groen schijfje op dat vak valt weg).
+
+            De functie geeft een tupel (tijd, route) terug, of (float('inf'), None) als de finish of een groen schijfje
+            niet meer bereikbaar is. De tijd bevat geen oppaktijd, net zoals bij de tour-solvers.
+
+            Als 'stats' een dictionary is, worden daarin de tellers van de tour-solver, "nodes", "recomputed" en de
+            duur van de fases "repair", "segments", "order" en "route" bijgehouden (zie STATISTIEKEN).
+        """
+
+        if stats is None:
+            stats = {}
+        started = time.perf_counter()
+        self.recomputed = 0
+        if blocked is not None:
+            self.block(blocked, stats)
+        started = phase_help(stats, "repair", started)
+
+        greens = sorted(self.board.greens - set(collected))
+        targets = set(greens)
+        targets.add(self.finish)
+
+        # segmenten vanaf de huidige positie, met de draaitijd vanuit de huidige rijrichting al inbegrepen
+        table = dict(self.table)
+        for (source, target) in self.table:
+            if source == current:
+                del table[(source, target)]
+        for target, (cost, route, last_direction) in headingSearchAll(self.board, current, targets, heading, stats).items():
+            if target != current:
+                first_direction = RICHTINGEN.index((route[1][0] - route[0][0], route[1][1] - route[0][1]))
+                table[(current, target)] = (cost, route, first_direction, last_direction)
+        self.recomputed += len(targets)
+        stats["recomputed"] = self.recomputed
+        started = phase_help(stats, "segments", started)
+
+        total, path = TOUR_SOLVERS[self.method](table, current, self.finish, greens, stats=stats)
+        started = phase_help(stats, "order", started)
+        if path is None:
+            return total, None
+        route = tourRoute(table, path)
+        phase_help(stats, "route", started)
+        return total, route
+
+###################################################################################################################
+############# MEERDERE WAGENTJES - groene schijfjes verdelen en botsingen vermijden ###############################
+###################################################################################################################
+
+# Met meerdere wagentjes op hetzelfde bord verdeelt 'planFleet' de groene schijfjes zo dat het laatste wagentje zo
+# vroeg mogelijk in zijn garage staat (de makespan). Elk wagentje heeft een eigen start en garage (finish).
+# - Per wagentje geeft een Held-Karp-tabel (zie 'heldKarp_help') de snelste tour voor elke deelverzameling van de
+#   groene schijfjes. Tot FLEET_EXACT_GREENS groene schijfjes wordt daarmee de beste verdeling exact gezocht
+#   (dynamisch programmeren over deelverzamelingen, O(k * 3^n)), daarboven met goedkoopste invoeging en lokaal
+#   zoeken (een schijfje van het traagste wagentje naar een ander verplaatsen).
+# - Daarna krijgt elk wagentje een tijdschema met reservaties per vak: een wagentje bezet een vak vanaf het moment
+#   dat het erheen begint te rijden tot het er helemaal uit gereden is, en zijn garage vanaf de aankomst voor altijd.
+#   Een wagentje dat een bezet vak moet binnenrijden wacht ervoor (instructie "W<seconden>"). De wagentjes worden een
+#   voor een ingepland, en van de geprobeerde volgordes wordt die met de kleinste makespan gekozen.
+# De tijden zijn die van 'calculateTime', met de draaitijd op de start en TIMEPICKUP per opgepikt schijfje erbij.
+
+FLEET_EXACT_GREENS = 10  # tot zoveel groene schijfjes wordt de verdeling exact gezocht
+FLEET_MAX_ORDERS = 24    # maximaal aantal volgordes waarin de wagentjes ingepland worden
+
+def subsetTimes_help(table, start, finish, greens, stats, start_direction=None):
+    """
+        geeft voor elke deelverzameling (bitmasker) van 'greens' de snelste tijd van start tot finish langs die
+        schijfjes terug, met het oppakken erbij, samen met de Held-Karp-tabellen om de volgorde terug te vinden.
+        Met 'start_direction' telt de draai op de start mee.
+    """
 
+    n = len(greens)
+    cost, parent, states = heldKarp_help(table, start, greens, stats, start_direction)
+    direct = tourTime(table, [start, finish], start_direction)
+    times = [float('inf') if direct is None else direct]
+    for mask in range(1, 1 << n):
+        times.append(heldKarpEnd_help(table, finish, greens, cost, states, mask)[0]
+                     + bin(mask).count("1") * TIMEPICKUP)
+    return times, (cost, parent, states)
 
-def getLegalNeighbours(board,pos):
+def partitionExact_help(times, n):
     """
-        De functie geeft een set terug met alle toegestane posities waar een wagentje naar toe kan
-        bewegen vanuit de gegeven positie 'pos'. De functie houdt daarbij rekening met de randen van het bord en
-        de posities waar er zich een rood schijfje bevindt.
+        verdeelt n groene schijfjes over de wagentjes met de kleinste makespan (bij gelijke makespan de kleinste
+        totale tijd). 'times[r][mask]' is de tijd van wagentje r voor de schijfjes uit 'mask'. Geeft (makespan,
+        bitmasker per wagentje) terug.
     """
 
-    output = set()
-    x, y = pos
-    max_x = len(board)
-    max_y = len(board[0])
+    k = len(times)
+    full = (1 << n) - 1
+    inf = float('inf')
+    # best[mask]: (makespan, totaal) van de eerste r wagentjes samen voor de schijfjes uit 'mask'
+    best = [(time, time) for time in times[0]]
+    choices = []
+    for r in range(1, k):
+        new = [(inf, inf)] * (full + 1)
+        choice = [0] * (full + 1)
+        for mask in ([full] if r == k - 1 else range(full + 1)):
+            sub = mask
+            while True:
+                before = best[mask ^ sub]
+                value = (max(before[0], times[r][sub]), before[1] + times[r][sub])
+                if value < new[mask]:
+                    new[mask] = value
+                    choice[mask] = sub
+                if sub == 0:
+                    break
+                sub = (sub - 1) & mask
+        choices.append(choice)
+        best = new
+
+    masks = [0] * k
+    mask = full
+    for r in range(k - 1, 0, -1):
+        masks[r] = choices[r - 1][mask]
+        mask ^= masks[r]
+    masks[0] = mask
+    return best[full][0], masks
+
+def partitionGreedy_help(tables, starts, finishes, greens):
+    """
+        verdeelt de groene schijfjes met goedkoopste invoeging (verste schijfjes eerst) en verplaatst daarna
+        schijfjes van het traagste wagentje naar een ander zolang de makespan daalt. Geeft (makespan, volgorde per
+        wagentje) terug.
+    """
 
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    k = len(tables)
+    inf = float('inf')
+
+    def time_help(r, order):
+        time = tourTime(tables[r], [starts[r]] + order + [finishes[r]])
+        return inf if time is None else time + len(order) * TIMEPICKUP
+
+    def insert_help(r, order, green):
+        # beste positie om 'green' in te voegen in 'order' van wagentje r: (tijd, nieuwe volgorde)
+        best = (inf, None)
+        for position in range(len(order) + 1):
+            new_order = order[:position] + [green] + order[position:]
+            time = time_help(r, new_order)
+            if time < best[0]:
+                best = (time, new_order)
+        return best
+
+    def value_help(times):
+        return max(times), sum(times)
+
+    orders = [[] for _ in range(k)]
+    times = [time_help(r, []) for r in range(k)]
+
+    def distance_help(green):
+        return min(tables[r][(starts[r], green)][0] if (starts[r], green) in tables[r] else inf for r in range(k))
+
+    for green in sorted(greens, key=distance_help, reverse=True):
+        best = None
+        for r in range(k):
+            time, order = insert_help(r, orders[r], green)
+            if order is None:
+                continue
+            value = value_help(times[:r] + [time] + times[r + 1:])
+            if best is None or value < best[0]:
+                best = (value, r, time, order)
+        if best is None:
+            return inf, None
+        _, r, times[r], orders[r] = best
+
+    improved = True
+    while improved:
+        improved = False
+        current = value_help(times)
+        slowest = times.index(max(times))
+        for green in orders[slowest]:
+            without = [g for g in orders[slowest] if g != green]
+            time_without = time_help(slowest, without)
+            for r in range(k):
+                if r == slowest:
+                    continue
+                time, order = insert_help(r, orders[r], green)
+                if order is None:
+                    continue
+                new_times = list(times)
+                new_times[slowest] = time_without
+                new_times[r] = time
+                if value_help(new_times) < (current[0] - 1e-9, inf):
+                    times = new_times
+                    orders[slowest] = without
+                    orders[r] = order
+                    improved = True
+                    break
+            if improved:
+                break
 
-    for dx, dy in directions:
-        new_x = x + dx
-        new_y = y + dy
+    return max(times), orders
 
-        if 0 <= new_x < max_x and 0 <= new_y < max_y and board[new_x][new_y] != "R":
-            output.add((new_x, new_y))
+def conflict_help(reservations, cell, begin, end, robot):
+    """
+        geeft het einde van de laatste reservatie van een ander wagentje op 'cell' terug die overlapt met
+        [begin, end], of None als het vak in die periode vrij is.
+    """
 
-    return output
+    latest = None
+    for other_begin, other_end, other in reservations.get(cell, ()):
+        if other != robot and other_begin < end - 1e-9 and begin < other_end - 1e-9:
+            latest = other_end if latest is None else max(latest, other_end)
+    return latest
 
-def calculateTime(route):
+def schedule_help(route, steps, reservations, robot):
+    """
+        plant het tijdschema van een wagentje in tussen de 'reservations' van de vorige wagentjes en voegt zijn
+        eigen reservaties toe. 'steps' bevat per stap (draaitijd voor de stap, oppaktijd na de stap). Geeft
+        (aankomsttijd in de garage, wachttijden {i: seconden}) terug, of None als er geen schema bestaat.
     """
-        De functie berekent de tijd die het wagentje nodig heeft om de gegeven route te rijden. De functie gebruikt
-        hiervoor de constanten TIMESTRAIGHT en TIMETURN.
 
-        Je mag ervan uitgaan dat het wagentje op de startpositie van de route de juiste orientatie bevat en niet meer
-        hoeft te draaien om de eerste stap te zetten.
+    inf = float('inf')
+    time = 0.0   # tijdstip waarop het wagentje klaar staat op route[i]
+    entered = 0.0 # tijdstip waarop het wagentje naar route[i] begon te rijden
+    waits = {}
+    own = []
+    for i, (turn, pickup) in enumerate(steps):
+        cell, target = route[i], route[i + 1]
+        depart = time + turn
+        # zonder wachten blijft het wagentje op 'target' tot het er in de volgende stap uit gereden is
+        stay = TIMESTRAIGHT + pickup + (steps[i + 1][0] + TIMESTRAIGHT if i + 1 < len(steps) else inf)
+        wait = 0.0
+        while True:
+            latest = conflict_help(reservations, target, depart + wait, depart + wait + stay, robot)
+            if latest is None:
+                break
+            if latest == inf:
+                return None
+            wait = latest - depart
+        if wait > 0:
+            if conflict_help(reservations, cell, entered, depart + wait + TIMESTRAIGHT, robot) is not None:
+                return None # het wagentje kan niet blijven staan waar het staat
+            waits[i] = wait
+        own.append((cell, entered, depart + wait + TIMESTRAIGHT))
+        entered = depart + wait
+        time = depart + wait + TIMESTRAIGHT + pickup
+
+    if conflict_help(reservations, route[-1], entered, inf, robot) is not None:
+        return None
+    own.append((route[-1], entered, inf))
+    for cell, begin, end in own:
+        reservations.setdefault(cell, []).append((begin, end, robot))
+    return time, waits
 
-        Je mag ervan uitgaan dat route een geldige route is, zijnde een lijst van tupels die de achtereenvolgende coordinaten
-        bevat waar het wagentje zich stap voor stap bevindt.
+def steps_help(route, start_direction, greens):
+    """
+        geeft per stap van 'route' (draaitijd voor de stap, oppaktijd na de stap) terug, zoals 'routeInstructions'
+        de instructies maakt.
     """
 
-    output = 0
-    prev = route[0]
-    prev_direction = 0
-    direction = 0 # 0 = up, 1 = right, 2 = down, 3 = left
-    straight = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    steps = []
+    direction = start_direction
+    collected = set()
+    for prev, curr in zip(route, route[1:]):
+        target_direction = RICHTINGEN.index((curr[0] - prev[0], curr[1] - prev[1]))
+        pickup = 0.0
+        if curr in greens and curr not in collected:
+            collected.add(curr)
+            pickup = TIMEPICKUP
+        steps.append((turnTime(direction, target_direction), pickup))
+        direction = target_direction
+    return steps
 
-    if len(route) <= 0:
-        return 0
-    
-    if route[0][0] == route[1][0]:
-        if route[0][1] < route[1][1]:
-            direction = 1
-        else:
-            direction = 3
+def planFleet(board, starts, finishes, start_directions=None, stats=None):
+    """
+        De functie verdeelt de groene schijfjes van het bord over meerdere wagentjes, met 'starts' en 'finishes'
+        (garages) de lijsten van start- en eindposities per wagentje, en plant voor elk wagentje een route en een
+        botsingsvrij tijdschema (zie hierboven). 'start_directions' is de rijrichting van elk wagentje op zijn start
+        (standaard 1 = right, zoals bij 'makeRouteFiles').
+
+        Als er geen botsingsvrij tijdschema bestaat voor de snelste routes (bv. omdat een garage op de enige weg van
+        een ander wagentje ligt), wordt opnieuw gepland met de garages van de andere wagentjes als rode schijfjes.
+        Lukt ook dat niet, dan wordt een ValueError opgegooid.
+
+        De functie geeft een tupel (makespan, wagentjes) terug, met per wagentje een dictionary met de "route", de
+        opgepikte "greens" (in volgorde), de wachttijden "waits" ({i: seconden}, zie 'routeInstructions') en de
+        aankomsttijd "time" in de garage, of (float('inf'), None) als een groen schijfje onbereikbaar is.
+        Als 'stats' een dictionary is, worden daarin de fasen "segments", "partition" en "schedule" bijgehouden.
+    """
+
+    k = len(starts)
+    if k == 0 or len(finishes) != k:
+        raise ValueError("!!! Error !!!: Geef evenveel starts als garages, minstens een")
+    if len(set(starts)) != k or len(set(finishes)) != k:
+        raise ValueError("!!! Error !!!: Twee wagentjes met dezelfde start of garage")
+    if start_directions is None:
+        start_directions = [1] * k
+    if stats is None:
+        stats = {}
+    stats.setdefault("nodes", 0)
+
+    board = asBoard(board)
+    result = fleet_help([board] * k, starts, finishes, start_directions, stats)
+    if result is None:
+        boards = []
+        for r in range(k):
+            blocked = board.copy()
+            for q in range(k):
+                if q != r and finishes[q] not in (starts[r], finishes[r]):
+                    putRed(blocked, *finishes[q])
+            boards.append(blocked)
+        result = fleet_help(boards, starts, finishes, start_directions, stats)
+    if result is None:
+        raise ValueError("!!! Error !!!: Geen botsingsvrij tijdschema gevonden")
+    return result
+
+def fleet_help(boards, starts, finishes, start_directions, stats):
+    """
+        verdeelt de groene schijfjes en plant de tijdschema's voor 'planFleet', met 'boards' het bord per wagentje.
+        Geeft (makespan, wagentjes) terug, (inf, None) als een groen schijfje onbereikbaar is, of None als er geen
+        botsingsvrij tijdschema gevonden is.
+    """
+
+    k = len(starts)
+    started = time.perf_counter()
+    greens = sorted(getGreens(boards[0]))
+    n = len(greens)
+    tables = [segmentTable(boards[r], starts[r], finishes[r], greens, "python", stats) for r in range(k)]
+    stats["segments"] = sum(len(table) for table in tables)
+    started = phase_help(stats, "segments", started)
+
+    if n <= FLEET_EXACT_GREENS:
+        subsets = [subsetTimes_help(tables[r], starts[r], finishes[r], greens, stats) for r in range(k)]
+        makespan, masks = partitionExact_help([times for times, _ in subsets], n)
+        orders = []
+        if makespan < float('inf'):
+            for r, mask in enumerate(masks):
+                cost, parent, states = subsets[r][1]
+                state = heldKarpEnd_help(tables[r], finishes[r], greens, cost, states, mask)[1] if mask else None
+                orders.append([] if state is None else heldKarpOrder_help(greens, parent, states, mask, state))
     else:
-        if route[0][0] < route[1][0]:
-            direction = 2
+        makespan, orders = partitionGreedy_help(tables, starts, finishes, greens)
+        if orders is not None:
+            # elke deelverzameling nog eens zo goed mogelijk ordenen
+            for r in range(k):
+                method = "heldkarp" if len(orders[r]) <= FLEET_EXACT_GREENS else "heuristic"
+                time_r, path = TOUR_SOLVERS[method](tables[r], starts[r], finishes[r], sorted(orders[r]))
+                if path is not None and time_r < tourTime(tables[r], [starts[r]] + orders[r] + [finishes[r]]):
+                    orders[r] = path[1:-1]
+    started = phase_help(stats, "partition", started)
+    if makespan == float('inf'):
+        return float('inf'), None
+
+    routes = [tourRoute(tables[r], [starts[r]] + orders[r] + [finishes[r]]) for r in range(k)]
+    steps = [steps_help(routes[r], start_directions[r], set(orders[r])) for r in range(k)]
+
+    best = None
+    by_length = sorted(range(k), key=lambda r: -sum(turn + pickup for turn, pickup in steps[r]) - len(steps[r]))
+    for priority in itertools.islice(itertools.permutations(by_length), FLEET_MAX_ORDERS):
+        # een wagentje staat op zijn start tot het zonder wachten vertrekt
+        reservations = {starts[r]: [(0.0, steps[r][0][0] + TIMESTRAIGHT if steps[r] else float('inf'), r)]
+                        for r in range(k)}
+        schedules = [None] * k
+        for r in priority:
+            schedules[r] = schedule_help(routes[r], steps[r], reservations, r)
+            if schedules[r] is None:
+                break
         else:
-            direction = 0
+            value = (max(s[0] for s in schedules), sum(s[0] for s in schedules))
+            if best is None or value < best[0]:
+                best = (value, schedules)
+    phase_help(stats, "schedule", started)
+    if best is None:
+        return None
 
-    #print(direction, "direction")
-    #print(straight[direction], "straight", (prev + straight[direction]), "prev + straight[direction]")
-    
-    for i, pos in enumerate(route):
-        if pos == prev:
-            #print(f"+0, totaal: {output}")
-            continue
-        if pos == (prev[0] + straight[direction][0], prev[1] + straight[direction][1]):
-            output += TIMESTRAIGHT
-            #print(f"+{TIMESTRAIGHT} (straight), totaal: {output}")
-        else:
-            prev_direction = direction
-            if prev[0] == route[i][0]:
-                if prev[1] < route[i][1]:
-                    direction = 1
-                else:
-                    direction = 3
-            else:
-                if prev[0] < route[i][0]:
-                    direction = 2
-                else:
-                    direction = 0
-            turn_steps = min(abs(prev_direction - direction), 4 - abs(prev_direction - direction))
-            output += TIMESTRAIGHT + (TIMETURN*turn_steps)
-            #print(f"+{TIMESTRAIGHT + (TIMETURN*turn_steps)} (turn + straight), totaal: {output}")
-        prev = pos
-        
-    return output
+    robots = [{"route": routes[r], "greens": orders[r], "waits": best[1][r][1], "time": best[1][r][0]}
+              for r in range(k)]
+    return best[0][0], robots
 
-# Geeft alleen posities en oppakken info, geen draaibewegingen, dus wordt niet gebruikt
-def makeInstructionfile(route, board):
+def makeFleetFiles(robots, board, start_directions=None, file="instructions_{}.txt", compact=False):
+    """
+        De functie schrijft voor elk wagentje uit 'planFleet' een instructiebestand (zoals instructions.txt, met
+        "W<seconden>" voor het wachten), met als naam file.format(nummer). Elk wagentje pikt enkel zijn eigen
+        groene schijfjes op. De functie geeft de lijst van bestandsnamen terug.
     """
-        De functie genereert een .txt-bestand dat kan gebruikt worden je wagentje de opgegeven route te laten rijden op het
-        opgegeven board.
 
-        Elke regel van het bestand drie met een komma van elkaar gescheiden waarden, namelijk:
-        rijnummer, kolomnummer, True/False
-        waarbij de derde waarde een boolean is die aangeeft of er op de gegeven positie een groen schijfje dient opgepikt
-        te worden.
+    if start_directions is None:
+        start_directions = [1] * len(robots)
+    names = []
+    for r, robot in enumerate(robots):
+        name = file.format(r)
+        with open(name, 'w') as output:
+            compileRoute(robot["route"], board, [PicoEmitter(output, compact)], start_directions[r],
+                         set(robot["greens"]), robot["waits"])
+        names.append(name)
+    return names
 
-        De functie gaat ervan uit dat "route" een geldige route is voor het opgegeven "board".
-    """
-    file = open('instructions.txt','w')
-    for pos in route:
-        pickup = "False"
-        if board[pos[0]][pos[1]] == "G":
-            pickup = "True"
-        outputstring = str(pos[0])+", "+str(pos[1]) +", " + pickup + "\n"
-        file.write(outputstring)
-    file.close()
+###################################################################################################################
+############# SCORE - zoveel mogelijk groene schijfjes binnen de speeltijd #########################################
+###################################################################################################################
 
-# Geeft ook draaibewegingen
-def makeInstructionfile2(route, board, start_direction=1):
-    if len(route) <= 1:
-            return
-    
-    outputstring = ""
-    prev = route[0]
-    direction = start_direction # 0 = up, 1 = right, 2 = down, 3 = left
-    straight = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    
-    collected_greens = set() # groene torentjes die al zijn opgepakt bijhouden
+# Een wedstrijd duurt een vaste tijd en elk opgepikt groen schijfje levert GREEN_POINTS punten op (het dashboard telt
+# 50 punten per "green tower"). Als niet alle groene schijfjes binnen die tijd opgepikt kunnen worden, kiest
+# 'planScore' de schijfjes en de volgorde met de hoogste score waarmee het wagentje nog op tijd op de finish staat.
+# Bij gelijke score wint de snelste route. De tijd is die van 'planRoute' (segmenttabel, met oppakken), met de draai
+# op de start erbij als de rijrichting op de start gegeven is, zodat de instructies echt binnen de tijd blijven.
+# - "exact": de Held-Karp-tabel geeft de snelste tour voor elke deelverzameling (zie 'subsetTimes_help'), de beste
+#   deelverzameling binnen de tijd is dan een opzoeking (tot SCORE_EXACT_GREENS groene schijfjes bij "auto").
+# - "heuristic": voeg telkens het schijfje in dat de route het minst verlengt zolang het binnen de tijd past, en
+#   verkort de route met 'tourHeuristic' als er niets meer past.
 
-    file = open('instructions.txt','w')
-    for curr in route[1:]:
-        dx = curr[0] - prev[0]
-        dy = curr[1] - prev[1]
+GREEN_POINTS = 50
+SCORE_EXACT_GREENS = 12
 
-        try:
-            target_direction = straight.index((dx, dy))
-        except ValueError:
-            raise ValueError(f"!!! Error !!!: Onmogelijke stap, van {prev} naar {curr}")
+def scoreExact_help(table, start, finish, greens, time_budget, start_direction, stats):
+    """
+        geeft de beste volgorde (lijst van groene schijfjes) binnen 'time_budget' terug, of None als er geen route
+        binnen de tijd bestaat.
+    """
 
-        turn_steps = (target_direction - direction) % 4
+    times, (cost, parent, states) = subsetTimes_help(table, start, finish, greens, stats, start_direction)
+    best = None
+    for mask, seconds in enumerate(times):
+        if seconds > time_budget + 1e-9:
+            continue
+        value = (bin(mask).count("1"), -seconds)
+        if best is None or value > best[0]:
+            best = (value, mask)
+    if best is None:
+        return None
 
-        if turn_steps == 1:
-            outputstring += "R\n"
-        elif turn_steps == 2:
-            outputstring += "T180\n"
-            #outputstring += "L\nL\n"
-        elif turn_steps == 3:
-            outputstring += "L\n"
+    mask = best[1]
+    if mask == 0:
+        return []
+    state = heldKarpEnd_help(table, finish, greens, cost, states, mask)[1]
+    return heldKarpOrder_help(greens, parent, states, mask, state)
 
-        outputstring += "F\n"
-        if board[curr[0]][curr[1]] == "G" and (curr[0], curr[1]) not in collected_greens:
-            outputstring += "P\n"
-            collected_greens.add((curr[0], curr[1]))
+def scoreHeuristic_help(table, start, finish, greens, time_budget, start_direction, stats):
+    """
+        geeft een goede volgorde (lijst van groene schijfjes) binnen 'time_budget' terug, of None als er geen route
+        binnen de tijd gevonden wordt.
+    """
 
-        direction = target_direction
+    def time_help(order):
+        seconds = tourTime(table, [start] + order + [finish], start_direction)
+        return None if seconds is None else seconds + len(order) * TIMEPICKUP
+
+    # de rechtstreekse route kan te lang zijn terwijl een omweg langs een groen schijfje (met een andere eerste
+    # rijrichting) wel past: dan is er nog geen geldige route (current = inf) tot er een schijfje ingevoegd is
+    current = time_help([])
+    if current is None or current > time_budget + 1e-9:
+        current = float('inf')
+
+    order = []
+    remaining = set(greens)
+    evaluated = 0
+    while remaining:
+        best = None
+        for green in sorted(remaining):
+            for position in range(len(order) + 1):
+                new_order = order[:position] + [green] + order[position:]
+                seconds = time_help(new_order)
+                evaluated += 1
+                if seconds is not None and seconds <= time_budget + 1e-9 and (best is None or seconds < best[0]):
+                    best = (seconds, new_order, green)
+        if best is None:
+            if not order:
+                break
+            # niets past meer: de route verkorten en opnieuw proberen
+            path = tourHeuristic(table, start, finish, sorted(order), time_budget=0.05)[1]
+            shorter = None if path is None else time_help(path[1:-1])
+            if shorter is None or shorter >= current - 1e-9:
+                break
+            order = path[1:-1]
+            current = shorter
+            continue
+        current, order, green = best
+        remaining.discard(green)
+        stats["evaluated"] = evaluated
+        progress_help("score", stats)
 
-        prev = curr
-    outputstring += "S"
-    file.write(outputstring)
-    file.close()
+    stats["evaluated"] = evaluated
+    return None if current == float('inf') else order
 
-# info voor website
-def makeWebsiteFile(route, board):
-    data = {}
-    
-    # diemensies van het bord
-    data['dimensions'] = {
-        'rows': len(board),
-        'cols': len(board[0])
-    }
-    
-    # hele bord
-    data['board'] = []
-    for row in board:
-        data['board'].append(['G' if cell == 'G' else 'R' if cell == 'R' else ' ' for cell in row])
-    
-    # groene torentjes die al zijn opgepakt
-    collected_greens = set()
-    
-    # route met oppakken info (maar nog zonder juiste orientatie) // uiteindelijk niet gebruikt
-    data['route'] = []
-    for pos in route:
-        is_pickup = board[pos[0]][pos[1]] == 'G' and pos not in collected_greens
-        if is_pickup:
-            collected_greens.add(pos)
-            
-        data['route'].append({
-            'row': pos[0],
-            'col': pos[1],
-            'pickup': is_pickup
-        })
-    
-    collected_greens = set()
-    
-    # instructies (met draaibewegingen)
-    data['instructions'] = []
-    prev = route[0]
-    direction = 1  # 0 = up, 1 = right, 2 = down, 3 = left
-    straight = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    
-    for curr in route[1:]:
-        dx = curr[0] - prev[0]
-        dy = curr[1] - prev[1]
-        
-        target_direction = straight.index((dx, dy))
-        turn_steps = (target_direction - direction) % 4
-        
-        if turn_steps == 1:
-            data['instructions'].append({'action': 'R'})
-        elif turn_steps == 2:
-            data['instructions'].append({'action': 'T180'})
-        elif turn_steps == 3:
-            data['instructions'].append({'action': 'L'})
-        
-        data['instructions'].append({'action': 'F', 'row': curr[0], 'col': curr[1]})
-        
-        if board[curr[0]][curr[1]] == "G" and curr not in collected_greens:
-            data['instructions'].append({'action': 'P'})
-            collected_greens.add(curr)
-        
-        direction = target_direction
-        prev = curr
-    
-    data['instructions'].append({'action': 'S'})
-    
-    # JSON bestand
-    with open('website.json', 'w') as file:
-        json.dump(data, file, indent=2)
+SCORE_METHODS = {"exact": scoreExact_help, "heuristic": scoreHeuristic_help}
+
+def planScore(board, start, finish, time_budget, method="auto", start_direction=None, stats=None):
+    """
+        De functie zoekt de route van 'start' naar 'finish' die binnen 'time_budget' seconden de meeste groene
+        schijfjes oppikt (zie hierboven). 'method' is "exact", "heuristic" of "auto" (exact tot SCORE_EXACT_GREENS
+        groene schijfjes). 'start_direction' is de rijrichting op de start (0 = up, 1 = right, 2 = down, 3 = left),
+        geef dezelfde mee als aan 'makeRouteFiles'; met None telt de eerste draai niet mee.
+
+        De functie geeft een tupel (score, tijd, route, greens) terug, met 'greens' de op te pikken groene schijfjes
+        in volgorde. Andere groene schijfjes waar de route over rijdt worden niet opgepikt, geef 'greens' daarom mee
+        aan 'compileRoute'. Als er geen route binnen de tijd is, is dat (0, float('inf'), None, []).
+        Als 'stats' een dictionary is, worden daarin de fasen "segments", "order" en "route" bijgehouden.
+    """
+
+    if method == "auto":
+        method = "exact" if len(getGreens(board)) <= SCORE_EXACT_GREENS else "heuristic"
+    if method not in SCORE_METHODS:
+        raise ValueError(f"!!! Error !!!: Onbekende methode '{method}', kies uit {sorted(SCORE_METHODS) + ['auto']}")
+    if stats is None:
+        stats = {}
+    started = time.perf_counter()
+
+    greens = sorted(getGreens(board))
+    stats.setdefault("nodes", 0)
+    table = segmentTable(board, start, finish, greens, "python", stats)
+    started = phase_help(stats, "segments", started)
+
+    order = SCORE_METHODS[method](table, start, finish, greens, time_budget, start_direction, stats)
+    started = phase_help(stats, "order", started)
+    if order is None:
+        return 0, float('inf'), None, []
+
+    path = [start] + order + [finish]
+    route = tourRoute(table, path)
+    phase_help(stats, "route", started)
+    return GREEN_POINTS * len(order), tourTime(table, path, start_direction) + len(order) * TIMEPICKUP, route, order
 
 ###################################################################################################################
 ############# BACKTRACKING - sub-optimaal #########################################################################
@@ -392,7 +2923,21 @@ def solve_help(board, finish, x, y, route=None):
 
     return routes
 
-def fastestRoute(board, start, finish):
+def fastestRouteBacktracking(board, start, finish):
+    """
+        Oorspronkelijke backtracking-versie van 'fastestRoute': somt alle routes tot MAX_PATH_LENGTH vakjes op en
+        kiest de snelste. Exponentieel in de lengte van de route, enkel nog bewaard om resultaten te vergelijken.
+    """
+
+    routes = solve_help(board, finish, start[0], start[1])
+
+    if not routes:
+        return None
+
+    fastest_route = min(routes, key=calculateTime)
+    return fastest_route
+
+def fastestRoute(board, start, finish, stats=None):
     """
         De functie geeft de snelste route terug  om van de positie 'start' naar de positie 'finish' te rijden op
         het gegeven bord. De route vermijdt daarbij de posities waar rode schijfjes aanwezig zijn.
@@ -401,76 +2946,551 @@ def fastestRoute(board, start, finish):
         van het gegeven bord respecteren.
 
         Dit zal Prof. Holvoet samen met jullie bekijken in de les in semesterweek 9.
-    """
 
-    routes = solve_help(board, finish, start[0], start[1])
+        De route wordt gezocht met 'headingSearch' (A* over vak en rijrichting), met dezelfde kosten als
+        'calculateTime' en zonder maximale lengte. Als 'finish' onbereikbaar is wordt 'None' teruggegeven.
 
-    if not routes:
+        Als 'stats' een dictionary is, worden daarin "nodes", "cache_hits", "cache_misses" en de duur van de fase
+        "search" bijgehouden (zie STATISTIEKEN).
+    """
+
+    if stats is None:
+        result = headingSearch(board, start, finish)
+    else:
+        started = time.perf_counter()
+        hits, misses = PATH_CACHE.hits, PATH_CACHE.misses
+        stats.setdefault("nodes", 0)
+        result = headingSearch(board, start, finish, None, stats)
+        stats["cache_hits"] = PATH_CACHE.hits - hits
+        stats["cache_misses"] = PATH_CACHE.misses - misses
+        phase_help(stats, "search", started)
+
+    if result is None:
         return None
 
-    fastest_route = min(routes, key=calculateTime)
-    return fastest_route
+    return list(result[1]) # kopie, de route zelf zit ook in de cache
+
+
+def planRoute(board, start, finish, method="permutations", start_direction=None, stats=None, on_improve=None,
+              cache=True, **options):
+    """
+        De functie berekent de route voor 'collect' zonder iets af te drukken.
+
+        De functie geeft een tupel (tijd, route) terug, met de tijd inclusief het oppakken van de groene schijfjes,
+        of (float('inf'), None) als er geen route bestaat. Zie 'collect' voor de betekenis van de parameters.
+
+        Als 'on_improve' gegeven is, wordt on_improve(tijd, route) opgeroepen met een eerste snelle route (de
+        dichtstbijzijnde-buur-volgorde), met elke betere route die de methode onderweg vindt (zie PROGRESSIVE_SOLVERS)
+        en tenslotte met het resultaat. De tijden zijn dezelfde als die van het resultaat.
+
+        Met 'cache' en zonder 'on_improve' lossen de methodes in ROUTE_CACHE_METHODS de canonieke vorm van het bord op
+        (zie SYMMETRIE) en wordt die route terug gedraaid; ze wordt bewaard in ROUTE_CACHE, zodat een gedraaid of
+        gespiegeld bord niet opnieuw opgelost wordt. Het resultaat hangt dus niet af van wat eerder gepland werd.
+        De tour-solvers kiezen tussen even snelle deelroutes, die op de groene schijfjes andere draaitijden kunnen
+        geven: met cache=False kan hun tijd op een gedraaid bord daarom verschillen. Enkel "exact" is in elke
+        stand dezelfde.
+    """
+
+    try:
+        return planRoute_help(board, start, finish, method, start_direction, stats, on_improve, cache, **options)
+    finally:
+        if DISK_CACHE is not None:
+            DISK_CACHE.flush() # alle nieuwe deelroutes van dit bord in een transactie
 
+def planRoute_help(board, start, finish, method, start_direction, stats, on_improve, cache, **options):
+    """
+        berekent de route voor 'planRoute' (zie daar), zonder de schijfcache weg te schrijven.
+    """
 
-def collect(board,start,finish):
+    if method != "exact" and method not in TOUR_SOLVERS:
+        raise ValueError(f"!!! Error !!!: Onbekende methode '{method}', kies uit {sorted(TOUR_SOLVERS) + ['exact']}")
+
+    if stats is None:
+        stats = {}
+    started = time.perf_counter()
+
+    board = asBoard(board)
+    if cache and on_improve is None and method in ROUTE_CACHE_METHODS and ROUTE_CACHE.maxsize > 0:
+        canonical, symmetry = canonicalBoard(board, start, finish, start_direction)
+        key = (canonical, method, tuple(sorted(options.items())), TIMESTRAIGHT, TIMETURN, TIMEPICKUP)
+        cached = ROUTE_CACHE.get(key)
+        if cached is not None:
+            stats["route_cache"] = "hit"
+            phase_help(stats, "cache", started)
+            cost, route = cached
+            if route is not None:
+                route = [symmetryInverse(pos, board.rows, board.cols, symmetry) for pos in route]
+            return cost, route
+        stats["route_cache"] = "miss"
+        rows, cols, cells, canonical_start, canonical_finish, direction = canonical
+        canonical_board = Board(rows, cols)
+        for i, cell in enumerate(cells):
+            if cell != 32: # " "
+                canonical_board.set(i // cols, i % cols, chr(cell))
+        cost, route = planRoute_help(canonical_board, canonical_start, canonical_finish, method,
+                                     None if direction == -1 else direction, stats, None, False, **options)
+        if route is not None:
+            route = tuple(route)
+        ROUTE_CACHE.put(key, (cost, route))
+        if route is not None:
+            route = [symmetryInverse(pos, board.rows, board.cols, symmetry) for pos in route]
+        return cost, route
+    hits, misses = SEGMENT_CACHE.hits + SEGMENT_REUSE.hits, SEGMENT_REUSE.misses
+    greens = sorted(getGreens(board))  # getGreens geeft een set terug, dus moet worden omgezet naar een lijst
+    backend = options.pop("backend", "python")
+
+    if method == "exact":
+        if on_improve is not None:
+            # eerst een snelle route via de segmenttabel, met de draaitijd op de start erbij zoals in 'collectExact'
+            table = segmentTable(board, start, finish, greens, backend)
+            quick, path = tourHeuristic(table, start, finish, greens, time_budget=0)
+            if path is not None:
+                route = tourRoute(table, path)
+                if start_direction is not None and len(route) > 1:
+                    quick += turnTime(start_direction, RICHTINGEN.index((route[1][0] - route[0][0], route[1][1] - route[0][1])))
+                on_improve(quick + len(greens)*TIMEPICKUP, route)
+        result = collectExact(board, start, finish, start_direction, stats)
+        phase_help(stats, "search", started)
+        if on_improve is not None and result[1] is not None:
+            on_improve(*result)
+        return result
+
+    stats.setdefault("nodes", 0)
+    table = segmentTable(board, start, finish, greens, backend, stats)
+    stats["cache_hits"] = SEGMENT_CACHE.hits + SEGMENT_REUSE.hits - hits
+    stats["cache_misses"] = SEGMENT_REUSE.misses - misses
+    started = phase_help(stats, "segments", started)
+
+    if on_improve is not None:
+        reported = [float('inf')]
+        def report_help(time, path):
+            # eerst altijd de dichtstbijzijnde-buur-volgorde, daarna enkel nog betere routes van de methode
+            if time < reported[0] - 1e-9:
+                reported[0] = time
+                on_improve(time + len(greens)*TIMEPICKUP, tourRoute(table, path))
+        quick, path = tourHeuristic(table, start, finish, greens, time_budget=0)
+        if path is not None:
+            report_help(quick, path)
+        if method in PROGRESSIVE_SOLVERS:
+            options["on_improve"] = report_help
+
+    shortest_length, shortest_path = TOUR_SOLVERS[method](table, start, finish, greens, stats=stats, **options)
+    started = phase_help(stats, "order", started)
+
+    if shortest_path is not None:
+        shortest_path = tourRoute(table, shortest_path)
+        phase_help(stats, "route", started)
+        if on_improve is not None:
+            on_improve(shortest_length + len(greens)*TIMEPICKUP, shortest_path)
+
+    return shortest_length + len(greens)*TIMEPICKUP, shortest_path
+
+def collect(board, start, finish, method="permutations", start_direction=None, **options):
     """
         Deze functie geeft de snelste route terug om van de positie 'start' naar de positie 'finish' te rijden op
         het gegeven bord, waarbij de posities van alle groene schijfjes onderweg worden aangedaan door de route.
 
-        Deze functie maakt gebruik van de hulpfunctie 'fastestRoute' en berekent de snelste route als een
-        aaneenschakeling van snelste routes tussen twee groene schijfjes onderling.
+        Behalve met "exact" is de route een aaneenschakeling van snelste routes tussen twee groene schijfjes onderling.
+        Die deelroutes worden eenmalig berekend in een segmenttabel (zie 'segmentTable'), zodat elke volgorde
+        beoordeeld wordt met opzoekingen in plaats van nieuwe zoekopdrachten. De tijd van een volgorde is die van
+        'calculateTime' op de samengestelde route plus het oppakken, dus met de draaitijden op de groene schijfjes
+        tussen twee deelroutes (zie 'tourTime'). Enkel de volgorde wordt gekozen: elke deelroute ligt vast, ook als
+        een andere, even snelle deelroute op een groen schijfje minder zou moeten draaien, en de rijrichting
+        'start_direction' op de start telt niet mee.
+
+        'method' kiest hoe de volgorde van de groene schijfjes bepaald wordt, zie TOUR_SOLVERS:
+        "permutations" probeert alle volgordes, "heldkarp" (dynamisch programmeren) en "branchbound" (branch-and-bound)
+        geven dezelfde snelste volgorde sneller, "parallel" verdeelt de branch-and-bound over meerdere processen.
+        "heuristic" geeft binnen een vaste rekentijd een goede (niet altijd de snelste) volgorde, zie 'tourHeuristic'.
+        Met "exact" zoekt 'collectExact' over de hele route in een keer: de deelroutes zelf worden dan ook gekozen
+        met het oog op de draaitijden op de groene schijfjes, en de draai vanuit 'start_direction' telt mee.
+
+        Extra keyword-argumenten ('options') worden doorgegeven aan de tour-solver, bv. time_budget=0.5, behalve
+        backend="numpy", dat de segmenttabel met NumPy laat berekenen (zie 'segmentTable'), en stats, een dictionary
+        die ingevuld wordt met de tellers en de duur van elke fase (zie STATISTIEKEN).
+    """
+
+    shortest_length, shortest_path = planRoute(board, start, finish, method, start_direction, **options)
+
+    print(f"Shortest path found with length: {shortest_length}")
+    return shortest_path
 
-        De functie houdt geen rekening met eventuele draaitijden die het wagentje nodig heeft om op de plek van het
-        groene schijfje zelf eventueel van richting te veranderen.
+def collectProgressive(board, start, finish, method="heldkarp", start_direction=None, stats=None, cancel=None,
+                       **options):
+    """
+        Generator-variant van 'collect': geeft een tupel (tijd, route) telkens er een betere route gevonden is, met
+        de tijd inclusief het oppakken van de groene schijfjes. De eerste route komt er meteen (dichtstbijzijnde buur),
+        de laatste is het resultaat van 'planRoute' met dezelfde parameters.
+
+        Er wordt gezocht in een aparte thread. Door de generator te sluiten (bv. met 'break' in een for-lus of met
+        close()) wordt de zoektocht afgebroken bij de volgende controle in de zoeklus (zie 'progress_help'). Vanuit
+        een andere thread kan dat met 'cancel', een threading.Event: zodra die gezet is stopt de generator.
+
+        Als 'stats' een dictionary is, worden daarin naast de tellers van 'planRoute' ook "solutions" (aantal
+        gegeven routes), "time_to_first" en "time_to_best" (seconden tot de eerste en de laatste route) en
+        "completed" bijgehouden. Als de zoektocht afgerond is en de methode exact is, is "time_to_optimal" de tijd
+        tot de optimale route.
     """
 
-    def generate_permutations(items):
-        if len(items) <= 1:
-            return [items]
-        perms = []
-        for i in range(len(items)):
-            rest = items[:i] + items[i+1:]
-            for p in generate_permutations(rest):
-                perms.append([items[i]] + p)
-        return perms
+    if stats is None:
+        stats = {}
+    stats["solutions"] = 0
+    stats["completed"] = False
+    if cancel is None:
+        cancel = threading.Event()
+    results = queue.Queue()
+    started = time.perf_counter()
 
-    shortest_path = None
-    shortest_length = float('inf')
+    def improve_help(cost, route):
+        results.put((cost, route))
 
-    greens = list(getGreens(board))  # getGreens geeft een set terug, dus moet worden omgezet naar een lijst
-    total_permutations = len(list(generate_permutations(greens)))
+    def worker_help():
+        cancel_state.event = cancel
+        try:
+            planRoute(board, start, finish, method, start_direction, stats, improve_help, **options)
+            results.put(None)
+        except Exception as e: # ook SearchCancelled
+            results.put(e)
+
+    thread = threading.Thread(target=worker_help, daemon=True)
+    thread.start()
+    best = float('inf')
+    try:
+        while True:
+            item = results.get()
+            if isinstance(item, SearchCancelled):
+                return
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            cost, route = item
+            if cost < best - 1e-9:
+                best = cost
+                now = time.perf_counter() - started
+                stats.setdefault("time_to_first", now)
+                stats["time_to_best"] = now
+                stats["solutions"] += 1
+                yield cost, route
+    finally:
+        cancel.set()
+        thread.join()
+
+    stats["completed"] = True
+    if method != "heuristic":
+        stats["time_to_optimal"] = stats.get("time_to_best")
 
-    for index, perm in enumerate(generate_permutations(greens), 1):
-        if index % 100 == 0 or index == total_permutations:
-            #print(f"Checking permutation {index}/{total_permutations} ({index/total_permutations*100:.2f}% complete)") # om progress bij te houden
-            pass
+###################################################################################################################
+############# BATCH - veel borden plannen (JSONL in, JSONL uit) ##################################################
+###################################################################################################################
 
-        path = [start] + perm + [finish]
-        total_route = []
-        valid = True
-        for i in range(len(path) - 1):
-            if path[i] != path[i + 1]:
-                segment = fastestRoute(board, path[i], path[i + 1])
-                if segment is None:
-                    valid = False
-                    break
-            else:
-                segment = [path[i]]  # Geen route nodig als de begin- en eindpunt dezelfde zijn
-            if i > 0:
-                if segment is None or len(segment) == 0:
-                    valid = False
-                    break
-                segment = segment[1:]
-            total_route.extend(segment)
-        if not valid:
-            continue
-        time = calculateTime(total_route)
-        if time < shortest_length:
-            shortest_length = time
-            shortest_path = total_route
+# Elke invoerregel is een JSON-object met een bord, bv.
+#   {"id": "b1", "rows": 4, "cols": 6, "greens": [[3, 0], [0, 5]], "reds": [[0, 1]], "start": [0, 0], "finish": [0, 0]}
+# of met "board" als lijst van rijen zoals in website.json. Elke uitvoerregel bevat id, tijd, route en instructies.
+# De borden worden lui ingelezen en met een begrensd aantal tegelijk gepland, zodat het geheugengebruik niet
+# groeit met de grootte van de invoer.
 
-    print(f"Shortest path found with length: {shortest_length + len(greens)*TIMEPICKUP}")
-    return shortest_path
+def boardFromJson(data):
+    """
+        De functie maakt een bord uit een JSON-object (zie hierboven) en geeft (board, start, finish) terug.
+        Een start of finish buiten het bord of op een rood schijfje geeft een ValueError.
+    """
+
+    if "board" in data:
+        rows = data["board"]
+        board = initiate_board(len(rows), len(rows[0]))
+        for i, row in enumerate(rows):
+            for j, cell in enumerate(row):
+                if cell == "G":
+                    putGreen(board, i, j)
+                elif cell == "R":
+                    putRed(board, i, j)
+    else:
+        board = initiate_board(data["rows"], data["cols"])
+        for x, y in data.get("greens", []):
+            putGreen(board, x, y)
+        for x, y in data.get("reds", []):
+            putRed(board, x, y)
+
+    if board is None:
+        raise ValueError("!!! Error !!!: Ongeldige afmetingen van het bord")
+    start = tuple(data.get("start", (0, 0)))
+    finish = tuple(data.get("finish", start))
+    for name, pos in (("start", start), ("finish", finish)):
+        if len(pos) != 2 or not all(isinstance(c, int) and not isinstance(c, bool) for c in pos):
+            raise ValueError(f"!!! Error !!!: Ongeldige {name} {list(pos)}, verwacht [rij, kolom]")
+        if not (0 <= pos[0] < board.rows and 0 <= pos[1] < board.cols):
+            raise ValueError(f"!!! Error !!!: {name.capitalize()} {list(pos)} ligt buiten het bord "
+                             f"({board.rows} x {board.cols})")
+        if pos in board.reds:
+            raise ValueError(f"!!! Error !!!: {name.capitalize()} {list(pos)} ligt op een rood schijfje")
+    return board, start, finish
+
+def line_help(line):
+    """
+        leest een invoerregel voor 'planBatch' en 'renderBatch': een ongeldige regel of een regel die geen JSON-object
+        is geeft een ValueError.
+    """
+
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("!!! Error !!!: Een invoerregel moet een JSON-object zijn")
+    return data
+
+def batch_plan_help(task):
+    """
+        plant een invoerregel voor 'planBatch' en geeft de uitvoerregel terug (ook bij fouten, met "error").
+    """
+
+    index, line, method, start_direction = task
+    result = {"index": index}
+    try:
+        data = line_help(line)
+        result["id"] = data.get("id", index)
+        board, start, finish = boardFromJson(data)
+        time, route = planRoute(board, start, finish, method, start_direction)
+        if route is None:
+            result["error"] = "geen route"
+        else:
+            result["time"] = time
+            result["route"] = route
+            result["instructions"] = makeInstructions(route, board, 1 if start_direction is None else start_direction)
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        result["error"] = str(e)
+    return json.dumps(result, separators=(",", ":"))
+
+def planBatch(lines, output, workers=None, ordered=True, method="heldkarp", start_direction=None, window=None):
+    """
+        De functie plant alle borden uit 'lines' (een iterable van JSON-regels, bv. een open bestand) en schrijft per
+        bord een JSON-regel naar 'output' (een bestand of ander object met write).
+
+        'workers' is het aantal processen (standaard het aantal processorkernen, 1 = in dit proces). Er zijn nooit
+        meer dan 'window' borden tegelijk onderweg (standaard 4 per proces). Met ordered=True komen de resultaten in
+        dezelfde volgorde als de invoer, anders zodra ze klaar zijn. Lege regels worden overgeslagen.
+
+        De functie geeft een dictionary terug met het aantal borden, de duur en het aantal borden per seconde.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if window is None:
+        window = 4 * workers
+
+    started = time.perf_counter()
+    count = 0
+    tasks = ((index, line, method, start_direction) for index, line in enumerate(lines) if line.strip())
+
+    if workers <= 1:
+        for task in tasks:
+            output.write(batch_plan_help(task) + "\n")
+            count += 1
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            pending = collections.deque()
+            for task in itertools.chain(tasks, [None]):
+                if task is not None:
+                    pending.append(executor.submit(batch_plan_help, task))
+                # resultaten wegschrijven zodra het venster vol is, en op het einde alles
+                while pending and (len(pending) >= window or task is None):
+                    if ordered:
+                        done = pending.popleft()
+                    else:
+                        finished, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        done = next(future for future in pending if future in finished)
+                        pending.remove(done)
+                    output.write(done.result() + "\n")
+                    count += 1
+
+    seconds = time.perf_counter() - started
+    return {"boards": count, "seconds": seconds, "boards_per_second": count / seconds if seconds > 0 else 0.0}
+
+###################################################################################################################
+############# TEKENEN - bord en route als SVG of PNG, zonder scherm ##############################################
+###################################################################################################################
+
+# 'renderSvg' en 'renderPng' tekenen het rooster, de groene en rode schijfjes en de route in een keer, zonder venster
+# en zonder te wachten, zodat ze ook op een server zonder scherm werken. PNG heeft Pillow nodig (optioneel), dat pas
+# bij de eerste PNG geladen wordt (zie 'pillow_help').
+# 'renderBatch' tekent alle borden uit een JSONL-bestand (zoals bij 'planBatch'), bv. om de routes na te kijken.
+# Alleen 'showShortestPath' gebruikt turtle, en importeert het pas wanneer het opgeroepen wordt.
+
+RENDER_COLORS = {"G": "#2e9d3a", "R": "#d0312d", "route": "#1f5fd1", "grid": "#808080"}
+
+def cellCenter_help(pos, cell_size):
+    return pos[1] * cell_size + cell_size / 2, pos[0] * cell_size + cell_size / 2
+
+def renderSvg(board, route=None, file=None, cell_size=50):
+    """
+        De functie tekent het bord en de route (een lijst van posities, of None) als SVG en geeft de tekst terug.
+        Als 'file' een bestandsnaam of een open bestand is, wordt de tekst ook daarin geschreven.
+    """
+
+    nrows = len(board)
+    ncols = len(board[0]) if nrows > 0 else 0
+    width, height = ncols * cell_size, nrows * cell_size
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width + 2}" height="{height + 2}" '
+             f'viewBox="-1 -1 {width + 2} {height + 2}">',
+             f'<rect width="{width}" height="{height}" fill="white"/>']
+    # het hele rooster als een pad
+    lines = [f"M0 {i * cell_size}H{width}" for i in range(nrows + 1)]
+    lines += [f"M{j * cell_size} 0V{height}" for j in range(ncols + 1)]
+    parts.append(f'<path d="{"".join(lines)}" stroke="{RENDER_COLORS["grid"]}" fill="none"/>')
+
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell in ("G", "R"):
+                x, y = cellCenter_help((i, j), cell_size)
+                parts.append(f'<circle cx="{x:g}" cy="{y:g}" r="{cell_size * 0.3:g}" fill="{RENDER_COLORS[cell]}"/>')
+
+    if route:
+        points = " ".join("%g,%g" % cellCenter_help(pos, cell_size) for pos in route)
+        parts.append(f'<polyline points="{points}" stroke="{RENDER_COLORS["route"]}" stroke-width="3" '
+                     f'stroke-linejoin="round" fill="none"/>')
+        x, y = cellCenter_help(route[0], cell_size)
+        parts.append(f'<circle cx="{x:g}" cy="{y:g}" r="{cell_size * 0.12:g}" fill="{RENDER_COLORS["route"]}"/>')
+        x, y = cellCenter_help(route[-1], cell_size)
+        size = cell_size * 0.24
+        parts.append(f'<rect x="{x - size / 2:g}" y="{y - size / 2:g}" width="{size:g}" height="{size:g}" '
+                     f'fill="none" stroke="{RENDER_COLORS["route"]}" stroke-width="3"/>')
+
+    parts.append("</svg>")
+    text = "\n".join(parts)
+
+    if file is not None:
+        file, opened = open_help(file)
+        file.write(text)
+        if opened:
+            file.close()
+    return text
+
+def pillow_help():
+    """
+        laadt Pillow pas wanneer er een PNG getekend wordt, zodat 'import kortsteRoute' (de planner, planServer en de
+        processen van planBatch) er niet op wacht, en geeft (Image, ImageDraw) terug.
+    """
+
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        raise ImportError("!!! Error !!!: Pillow is niet geinstalleerd, teken als SVG (renderSvg, fmt='svg')") from None
+    return Image, ImageDraw
+
+def renderPng(board, route=None, file="route.png", cell_size=50):
+    """
+        De functie tekent het bord en de route (een lijst van posities, of None) als PNG in 'file' (een bestandsnaam
+        of een binair geopend bestand) en geeft de afbeelding (Pillow) terug. Zonder Pillow wordt een ImportError
+        opgegooid.
+    """
+
+    Image, ImageDraw = pillow_help()
+
+    nrows = len(board)
+    ncols = len(board[0]) if nrows > 0 else 0
+    width, height = ncols * cell_size, nrows * cell_size
+    image = Image.new("RGB", (width + 1, height + 1), "white")
+    draw = ImageDraw.Draw(image)
+
+    for i in range(nrows + 1):
+        draw.line([(0, i * cell_size), (width, i * cell_size)], fill=RENDER_COLORS["grid"])
+    for j in range(ncols + 1):
+        draw.line([(j * cell_size, 0), (j * cell_size, height)], fill=RENDER_COLORS["grid"])
+
+    radius = cell_size * 0.3
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell in ("G", "R"):
+                x, y = cellCenter_help((i, j), cell_size)
+                draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=RENDER_COLORS[cell])
+
+    if route:
+        points = [cellCenter_help(pos, cell_size) for pos in route]
+        if len(points) > 1:
+            draw.line(points, fill=RENDER_COLORS["route"], width=3, joint="curve")
+        x, y = points[0]
+        radius = cell_size * 0.12
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=RENDER_COLORS["route"])
+        x, y = points[-1]
+        size = cell_size * 0.12
+        draw.rectangle([x - size, y - size, x + size, y + size], outline=RENDER_COLORS["route"], width=3)
+
+    image.save(file, format="PNG")
+    return image
+
+RENDERERS = {"svg": renderSvg, "png": renderPng}
+
+def render_help(task):
+    """
+        tekent een invoerregel voor 'renderBatch' en geeft een dictionary terug met de index, het bestand en
+        eventueel "error".
+    """
+
+    index, line, directory, fmt, method, start_direction, cell_size = task
+    result = {"index": index}
+    try:
+        data = line_help(line)
+        name = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(data.get("id", index)))
+        board, start, finish = boardFromJson(data)
+        route = data.get("route")
+        if route is None:
+            route = planRoute(board, start, finish, method, start_direction)[1]
+        else:
+            route = [tuple(pos) for pos in route]
+        result["file"] = os.path.join(directory, f"{name}.{fmt}")
+        RENDERERS[fmt](board, route, result["file"], cell_size)
+        if route is None:
+            result["error"] = "geen route"
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        result["error"] = str(e)
+    return result
+
+def renderBatch(lines, directory, fmt="svg", workers=1, method="heldkarp", start_direction=None, cell_size=50,
+                window=None):
+    """
+        De functie tekent alle borden uit 'lines' (JSON-regels zoals bij 'planBatch') als een bestand per bord in
+        'directory', met als naam het "id" van het bord (of het regelnummer) en als extensie 'fmt' ("svg" of "png").
+        Een regel met een "route" wordt zo getekend, anders wordt de route eerst gepland met 'method'. Een bord
+        zonder route wordt zonder route getekend.
+
+        'workers' is het aantal processen (None = het aantal processorkernen), er zijn nooit meer dan 'window'
+        borden tegelijk onderweg (standaard 4 per proces). De functie geeft een dictionary terug met het aantal
+        borden, het aantal fouten, de duur en het aantal borden per seconde.
+    """
+
+    if fmt not in RENDERERS:
+        raise ValueError(f"!!! Error !!!: Onbekend formaat '{fmt}', kies uit {sorted(RENDERERS)}")
+    if fmt == "png":
+        pillow_help()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if window is None:
+        window = 4 * workers
+
+    os.makedirs(directory, exist_ok=True)
+    started = time.perf_counter()
+    count = errors = 0
+    tasks = ((index, line, directory, fmt, method, start_direction, cell_size)
+             for index, line in enumerate(lines) if line.strip())
+
+    if workers <= 1:
+        results = map(render_help, tasks)
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(workers)
+        # per venster van 'window' borden, zodat de invoer niet in een keer ingelezen wordt
+        chunks = iter(lambda: list(itertools.islice(tasks, window)), [])
+        results = itertools.chain.from_iterable(executor.map(render_help, chunk) for chunk in chunks)
+
+    try:
+        for result in results:
+            count += 1
+            errors += "error" in result
+    finally:
+        if workers > 1:
+            executor.shutdown()
+
+    seconds = time.perf_counter() - started
+    return {"boards": count, "errors": errors, "seconds": seconds,
+            "boards_per_second": count / seconds if seconds > 0 else 0.0}
 
 # (Extra)functie om het bord en de route grafisch te tekenen (grotendeels door AI geschreven)
 def showShortestPath(board, route):
@@ -480,7 +3500,10 @@ def showShortestPath(board, route):
     - Het bord wordt als een rooster getekend.
     - Groene en rode schijfjes worden in hun cel getoond.
     - De route wordt getekend als een blauwe lijn tussen de cellen.
+
+    Voor een tekening zonder venster, zie 'renderSvg' en 'renderPng'.
     """
+    import turtle # enkel hier nodig, zodat 'import kortsteRoute' geen turtle (en Tk) laadt
     cell_size = 50
     nrows = len(board)
     ncols = len(board[0]) if nrows > 0 else 0
@@ -557,6 +3580,43 @@ def showShortestPath(board, route):
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Kortste route voor het wagentje van team 209")
+    parser.add_argument("--batch", nargs=2, metavar=("INVOER", "UITVOER"),
+                        help="plan alle borden uit een JSONL-bestand ('-' = stdin/stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="aantal processen voor --batch")
+    parser.add_argument("--unordered", action="store_true", help="resultaten wegschrijven zodra ze klaar zijn")
+    parser.add_argument("--method", default="heldkarp", help="methode voor --batch en --render (zie collect)")
+    parser.add_argument("--render", nargs=2, metavar=("INVOER", "MAP"),
+                        help="teken alle borden uit een JSONL-bestand ('-' = stdin) als SVG of PNG in MAP")
+    parser.add_argument("--format", default="svg", choices=sorted(RENDERERS), help="formaat voor --render en --save")
+    parser.add_argument("--save", metavar="BESTAND", help="teken het voorbeeldbord in BESTAND in plaats van met turtle")
+    parser.add_argument("--cache", metavar="BESTAND", help="bewaar deelroutes en routes ook in een SQLite-bestand")
+    parser.add_argument("--budget", type=float, metavar="SECONDEN",
+                        help="pik op het voorbeeldbord zoveel mogelijk groene schijfjes op binnen SECONDEN")
+    args = parser.parse_args()
+
+    if args.cache:
+        try:
+            openDiskCache(args.cache)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.batch:
+        source = sys.stdin if args.batch[0] == "-" else open(args.batch[0])
+        target = sys.stdout if args.batch[1] == "-" else open(args.batch[1], "w")
+        summary = planBatch(source, target, args.workers, not args.unordered, args.method)
+        if target is not sys.stdout:
+            target.close()
+        print(f"{summary['boards']} borden in {summary['seconds']:.2f} s ({summary['boards_per_second']:.1f} borden/s)", file=sys.stderr)
+        sys.exit(0)
+
+    if args.render:
+        source = sys.stdin if args.render[0] == "-" else open(args.render[0])
+        summary = renderBatch(source, args.render[1], args.format, args.workers, args.method)
+        print(f"{summary['boards']} borden getekend in {summary['seconds']:.2f} s ({summary['errors']} fouten, "
+              f"{summary['boards_per_second']:.1f} borden/s)", file=sys.stderr)
+        sys.exit(0)
+
     # board = initiate_board(int(input("Geef aantal rijen: ")), int(input("Geef aantal kolommen: ")))
     board = initiate_board(4, 6)
     
@@ -599,8 +3659,17 @@ if __name__ == "__main__":
     '''
 
     #print("route:", solve_help(board, (1, 3), 0, 0))
-    beste_route = collect(board,(0,0),(0,0))
-    makeInstructionfile2(beste_route, board)
-    makeWebsiteFile(beste_route, board)
+    if args.budget is not None:
+        score, tijd, beste_route, opgepikt = planScore(board, (0,0), (0,0), args.budget, start_direction=1)
+        if beste_route is None:
+            sys.exit(f"!!! Error !!!: Geen route binnen {args.budget} s")
+        print(f"score {score} in {tijd:.1f} s:", opgepikt)
+        makeRouteFiles(beste_route, board, start_direction=1, compact=True, greens=set(opgepikt))
+    else:
+        beste_route = collect(board,(0,0),(0,0), method="exact", start_direction=1)
+        makeRouteFiles(beste_route, board, start_direction=1, compact=True)
+    if args.save:
+        RENDERERS[args.format](board, beste_route, args.save)
+        sys.exit(0)
     input("toon (druk op enter):")
     showShortestPath(board, beste_route)
\ No newline at end of file
@@ -0,0 +1,199 @@
+# planServer.py
+# Lokale planningsdienst rond kortsteRoute.py: het proces blijft draaien, zodat de caches van kortsteRoute (SEGMENT_CACHE,
+# SEGMENT_REUSE, PATH_CACHE en ROUTE_CACHE) warm blijven tussen twee aanvragen en er geen nieuwe Python-start nodig is bij elk nieuw bord.
+# Gebruik:
+#   python planServer.py --port 8765
+#   curl -X POST localhost:8765/plan -d '{"rows": 4, "cols": 6, "greens": [[3, 0], [0, 5]], "reds": [[0, 1]]}'
+#
+# Aanvragen:
+#   POST /plan    een bord als JSON zoals bij 'boardFromJson' (met "board" zoals in website.json, of met rows, cols,
+#                 greens en reds), met optioneel "start", "finish", "start_direction", "method" (zie 'collect', of
+#                 "fastest" voor 'fastestRoute' zonder groene schijfjes), "time_budget" en "compact".
+#                 Het antwoord heeft de vorm van website.json (dimensions, board, instructions) met daarbij "time"
+#                 (de geschatte rijtijd), "pico" (de inhoud van instructions.txt) en "latency" (duur in ms van het
+#                 plannen, het compileren en de hele aanvraag), "phases" en "cache" (zie STATISTIEKEN in kortsteRoute,
+#                 met "route" de hit of miss in ROUTE_CACHE).
+#   GET /stats    aantal aanvragen, gemiddelde duur en de statistieken van de caches (met --disk-cache ook "disk")
+#   GET /health   {"status": "ok"}
+# Elke aanvraag mag van een andere oorsprong komen (CORS), zodat het dashboard de dienst rechtstreeks kan gebruiken.
+
+import argparse
+import http.server
+import io
+import json
+import math
+import sys
+import threading
+import time
+
+import kortsteRoute
+
+DEFAULT_METHOD = "heldkarp"
+MAX_BODY = 1 << 20  # grootste aanvaarde aanvraag (bytes)
+
+PLAN_LOCK = threading.Lock()  # de caches van kortsteRoute zijn niet thread-safe: er wordt een bord tegelijk gepland
+COUNTERS = {"requests": 0, "errors": 0, "seconds": 0.0}
+
+class PlanError(Exception):
+    """
+        Fout in een aanvraag, met de HTTP-statuscode die teruggestuurd wordt.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def planRequest(data, method=DEFAULT_METHOD):
+    """
+        De functie plant het bord uit 'data' (een dictionary, zie hierboven) en geeft de tekst van het JSON-antwoord
+        en de latency (een dictionary met de duur in ms) terug. 'method' wordt gebruikt als 'data' geen methode geeft.
+        Als er geen route bestaat wordt PlanError (422) opgegooid.
+    """
+
+    started = time.perf_counter()
+    board, start, finish = kortsteRoute.boardFromJson(data)
+    method = data.get("method", method)
+    start_direction = data.get("start_direction")
+    stats = {}
+
+    if method == "fastest":
+        route = kortsteRoute.fastestRoute(board, start, finish, stats)
+        cost = math.inf if route is None else kortsteRoute.calculateTime(route) if len(route) > 1 else 0.0
+    else:
+        options = {"time_budget": data["time_budget"]} if "time_budget" in data else {}
+        cost, route = kortsteRoute.planRoute(board, start, finish, method, start_direction, stats, **options)
+    if route is None:
+        raise PlanError(422, "geen route")
+    planned = time.perf_counter()
+
+    website = io.StringIO()
+    pico = io.StringIO()
+    kortsteRoute.compileRoute(route, board, [kortsteRoute.WebsiteEmitter(website, board),
+                                             kortsteRoute.PicoEmitter(pico, bool(data.get("compact", False)))],
+                              1 if start_direction is None else start_direction)
+    compiled = time.perf_counter()
+
+    latency = {
+        "plan_ms": (planned - started) * 1000,
+        "compile_ms": (compiled - planned) * 1000,
+        "total_ms": (compiled - started) * 1000,
+    }
+    extra = {
+        "time": cost,
+        "pico": pico.getvalue(),
+        "latency": latency,
+        "phases": stats.get("phases", {}),
+        "cache": {"hits": stats.get("cache_hits"), "misses": stats.get("cache_misses"), "route": stats.get("route_cache")},
+    }
+    # website.json eindigt op "}": de extra velden worden er zonder opnieuw te parsen aan toegevoegd
+    return website.getvalue()[:-1] + "," + json.dumps(extra, separators=(",", ":"))[1:], latency
+
+class PlanHandler(http.server.BaseHTTPRequestHandler):
+    """
+        Behandelt de aanvragen voor 'makeServer' (zie hierboven).
+    """
+
+    def send_help(self, status, text, latency=None):
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if latency is not None:
+            self.send_header("Server-Timing", f"plan;dur={latency['plan_ms']:.2f}, compile;dur={latency['compile_ms']:.2f}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def error_help(self, status, message):
+        COUNTERS["errors"] += 1
+        self.send_help(status, json.dumps({"error": message}))
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_help(200, json.dumps({"status": "ok"}))
+        elif self.path == "/stats":
+            with PLAN_LOCK:
+                report = dict(COUNTERS, caches=kortsteRoute.cacheStats())
+            report["mean_ms"] = report["seconds"] * 1000 / report["requests"] if report["requests"] else 0.0
+            self.send_help(200, json.dumps(report))
+        else:
+            self.error_help(404, f"onbekend pad '{self.path}'")
+
+    def do_POST(self):
+        if self.path != "/plan":
+            self.error_help(404, f"onbekend pad '{self.path}'")
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY:
+            self.error_help(413 if length > MAX_BODY else 400, "ongeldige lengte van de aanvraag")
+            return
+
+        started = time.perf_counter()
+        try:
+            data = json.loads(self.rfile.read(length))
+            if not isinstance(data, dict):
+                raise PlanError(400, "de aanvraag moet een JSON-object zijn")
+            with PLAN_LOCK:
+                text, latency = planRequest(data, self.server.method)
+                COUNTERS["requests"] += 1
+                COUNTERS["seconds"] += time.perf_counter() - started
+        except PlanError as e:
+            self.error_help(e.status, str(e))
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            self.error_help(400, str(e))
+        else:
+            self.send_help(200, text, latency)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def makeServer(host="127.0.0.1", port=8765, method=DEFAULT_METHOD, verbose=False):
+    """
+        De functie maakt de server (nog niet gestart, zie serve_forever). Elke aanvraag krijgt een eigen thread,
+        zodat /health en /stats blijven antwoorden terwijl er een bord gepland wordt.
+    """
+
+    if method != "fastest" and method != "exact" and method not in kortsteRoute.TOUR_SOLVERS:
+        raise ValueError(f"!!! Error !!!: Onbekende methode '{method}'")
+    server = http.server.ThreadingHTTPServer((host, port), PlanHandler)
+    server.method = method
+    server.verbose = verbose
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokale planningsdienst rond kortsteRoute.py")
+    parser.add_argument("--host", default="127.0.0.1", help="adres om op te luisteren")
+    parser.add_argument("--port", type=int, default=8765, help="poort om op te luisteren")
+    parser.add_argument("--method", default=DEFAULT_METHOD, help="standaardmethode (zie 'collect', of 'fastest')")
+    parser.add_argument("--cache-size", type=int, help="maximale grootte van de segmentcache")
+    parser.add_argument("--disk-cache", metavar="BESTAND", help="bewaar deelroutes en routes ook in een SQLite-bestand")
+    parser.add_argument("--verbose", action="store_true", help="elke aanvraag afdrukken")
+    args = parser.parse_args(argv)
+
+    if args.cache_size is not None:
+        kortsteRoute.configureCaches(segment_size=args.cache_size)
+    try:
+        if args.disk_cache:
+            kortsteRoute.openDiskCache(args.disk_cache)
+        server = makeServer(args.host, args.port, args.method, args.verbose)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Planningsdienst op http://{args.host}:{server.server_address[1]}/plan", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+# planner.py
+# Kleine planner voor op het wagentje (CircuitPython), afgeleid van kortsteRoute.py en met dezelfde kosten
+# (TIMESTRAIGHT, TIMETURN en TIMEPICKUP), maar binnen het beperkte geheugen van de Pico:
+# - het bord is een platte bytearray (0 = vrij, 1 = rood, 2 = groen), een toestand is vak * 4 + rijrichting;
+# - de kosten zijn gehele getallen (in eenheden van STAP tienden van een seconde), zodat de deelroutes gezocht
+#   worden met een bucket-wachtrij (Dial) in plaats van een heap;
+# - de volgorde van de groene schijfjes wordt bepaald met Held-Karp over (groene schijfjes, laatste schijfje,
+#   rijrichting bij aankomst), dus met de draaitijd op de groene schijfjes erbij, zonder recursie;
+# - er wordt geen lijst van routes bijgehouden: de segmenttabel bevat enkel kosten en pas bij het schrijven wordt
+#   elke deelroute opnieuw gezocht en meteen als instructies weggeschreven (compact formaat, "F3" = drie keer "F",
+#   zie RouteReader in code.py);
+# - voor er iets groots aangemaakt wordt, wordt het geheugengebruik geschat en vergeleken met 'cap'.
+# Het resultaat ligt tussen dat van planRoute(board, start, finish, "heldkarp") en 'collectExact' in kortsteRoute.py.
+# Gebruik (zie code.py):
+#   stats = planner.planBoard({"rows": 5, "cols": 7, "greens": [[1, 2]], "reds": [[0, 3]]}, stream)
+
+import array
+import gc
+import time
+
+TIMESTRAIGHT = 24  # tienden van een seconde, zoals TIMESTRAIGHT in kortsteRoute.py
+TIMETURN = 30      # tienden van een seconde per kwartslag
+TIMEPICKUP = 10    # tienden van een seconde per groen schijfje
+
+RICHTINGEN = ((-1, 0), (0, 1), (1, 0), (0, -1)) # 0 = up, 1 = right, 2 = down, 3 = left
+
+DEFAULT_CAP = 48 * 1024  # maximaal geschat geheugengebruik (bytes)
+MAX_GREENS = 10
+ONBEREIKBAAR = 0xFFFF    # in de afstanden, de segmenttabel en de Held-Karp-tabel
+
+def gcd_help(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+STAP = gcd_help(TIMESTRAIGHT, TIMETURN)  # alle rij- en draaitijden zijn een veelvoud van STAP
+RECHT = TIMESTRAIGHT // STAP
+DRAAI = TIMETURN // STAP
+NBUCKETS = max(RECHT, 2 * DRAAI) + 1     # grootste stap in de wachtrij + 1
+
+class Plan:
+    """
+        Het bord als platte bytearray, met de afstanden, de ouders en de wachtrij die bij elke zoektocht
+        hergebruikt worden.
+    """
+
+    __slots__ = ("rows", "cols", "grid", "greens", "dist", "parent", "buckets")
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.grid = bytearray(rows * cols)
+        self.greens = []
+        self.dist = array.array("H", bytes(2 * 4 * rows * cols))
+        self.parent = array.array("H", bytes(2 * 4 * rows * cols)) # vorige toestand + 1, 0 = vertrek
+        self.buckets = [[] for _ in range(NBUCKETS)]
+
+def estimateMemory(rows, cols, greens):
+    """
+        De functie schat het geheugengebruik (bytes) van 'planBoard' voor een bord met de gegeven afmetingen en
+        het gegeven aantal groene schijfjes.
+    """
+
+    states = 4 * rows * cols
+    grid = 2 * rows * cols + 2 * states + 2 * 2 * states  # bord, opgepikt, zetten van een deelroute, dist, parent
+    queue = 3 * states * 4                                 # elke toestand hoogstens 3 keer in de wachtrij
+    table = 2 * (4 * greens + 1) * (greens + 1) * 4         # segmenttabel
+    dp = (1 << greens) * greens * 4 * (2 + 1)             # kosten en vorige toestand
+    return grid + queue + table + dp + 256
+
+def parse_help(data):
+    """
+        leest een JSON-object zoals bij 'boardFromJson' in kortsteRoute.py en geeft (rijen, kolommen, start, finish,
+        groene schijfjes, rode schijfjes) terug.
+    """
+
+    if "board" in data:
+        rows, cols = len(data["board"]), len(data["board"][0])
+        greens = [(i, j) for i, row in enumerate(data["board"]) for j, cell in enumerate(row) if cell == "G"]
+        reds = [(i, j) for i, row in enumerate(data["board"]) for j, cell in enumerate(row) if cell == "R"]
+    else:
+        rows, cols = data["rows"], data["cols"]
+        greens = data.get("greens", [])
+        reds = data.get("reds", [])
+    if rows <= 0 or cols <= 0 or 4 * rows * cols >= ONBEREIKBAAR:
+        raise ValueError("!!! Error !!!: Ongeldige afmetingen van het bord")
+
+    start = tuple(data.get("start", (0, 0)))
+    finish = tuple(data.get("finish", start))
+    return rows, cols, start, finish, greens, reds
+
+def search_help(plan, source, heading, target=-1, target_heading=-1):
+    """
+        zoekt vanuit de toestand (source, heading) de snelste toestanden met een bucket-wachtrij en vult plan.dist en
+        plan.parent in. Met heading -1 is de rijrichting op 'source' vrij. Met een 'target' stopt de zoektocht zodra
+        dat vak bereikt is (met 'target_heading' als rijrichting, of een willekeurige bij -1) en wordt die toestand
+        teruggegeven (of -1 als het vak onbereikbaar is).
+    """
+
+    rows, cols, grid, dist, parent, buckets = plan.rows, plan.cols, plan.grid, plan.dist, plan.parent, plan.buckets
+    for state in range(len(dist)):
+        dist[state] = ONBEREIKBAAR
+    for bucket in buckets:
+        bucket.clear()
+
+    waiting = 0
+    for h in range(4):
+        if heading < 0 or h == heading:
+            dist[source * 4 + h] = 0
+            parent[source * 4 + h] = 0
+            buckets[0].append(source * 4 + h)
+            waiting += 1
+    cost = 0
+
+    while waiting:
+        bucket = buckets[cost % NBUCKETS]
+        while bucket:
+            state = bucket.pop()
+            waiting -= 1
+            if dist[state] != cost:
+                continue # al goedkoper bereikt
+            cell = state >> 2
+            h = state & 3
+            if cell == target and (target_heading < 0 or h == target_heading):
+                return state
+
+            # rechtdoor
+            dx, dy = RICHTINGEN[h]
+            x, y = divmod(cell, cols)
+            x += dx
+            y += dy
+            if 0 <= x < rows and 0 <= y < cols and grid[x * cols + y] != 1:
+                new_state = (x * cols + y) * 4 + h
+                if cost + RECHT < dist[new_state]:
+                    dist[new_state] = cost + RECHT
+                    parent[new_state] = state + 1
+                    buckets[(cost + RECHT) % NBUCKETS].append(new_state)
+                    waiting += 1
+
+            # draaien op het vak
+            for turn in (1, 3, 2):
+                new_state = cell * 4 + ((h + turn) & 3)
+                new_cost = cost + (2 * DRAAI if turn == 2 else DRAAI)
+                if new_cost < dist[new_state]:
+                    dist[new_state] = new_cost
+                    parent[new_state] = state + 1
+                    buckets[new_cost % NBUCKETS].append(new_state)
+                    waiting += 1
+        cost += 1
+
+    return -1
+
+def order_help(table, n):
+    """
+        Held-Karp zonder recursie over de segmenttabel van 'planBoard'. Een toestand is (bezochte groene schijfjes,
+        laatste schijfje j, rijrichting h bij aankomst). De functie geeft (kost, volgorde) terug, met de volgorde een
+        bytearray van toestanden j * 4 + h, of (ONBEREIKBAAR, None) als er geen route bestaat.
+    """
+
+    width = (n + 1) * 4 # een rij van de segmenttabel: aankomst (schijfje of finish, rijrichting)
+    if n == 0:
+        best = min(table[n * 4 + h] for h in range(4))
+        return (ONBEREIKBAAR, None) if best == ONBEREIKBAAR else (best, bytearray())
+
+    size = (1 << n) * n * 4
+    dp = array.array("H", bytes(2 * size))
+    for index in range(size):
+        dp[index] = ONBEREIKBAAR
+    previous = bytearray(size) # vorige toestand j * 4 + h + 1, 0 = vanaf de start
+    for target in range(n * 4):
+        dp[(1 << (target >> 2)) * n * 4 + target] = table[target]
+
+    for mask in range(1, 1 << n):
+        base = mask * n * 4
+        for here in range(n * 4):
+            cost = dp[base + here]
+            if cost == ONBEREIKBAAR:
+                continue
+            row = (1 + here) * width
+            for k in range(n):
+                if mask & (1 << k):
+                    continue
+                next_base = (mask | (1 << k)) * n * 4 + k * 4
+                for h in range(4):
+                    step = table[row + k * 4 + h]
+                    if step != ONBEREIKBAAR and cost + step < dp[next_base + h]:
+                        dp[next_base + h] = cost + step
+                        previous[next_base + h] = here + 1
+
+    full = (1 << n) - 1
+    best, last = ONBEREIKBAAR, -1
+    for here in range(n * 4):
+        cost = dp[full * n * 4 + here]
+        if cost == ONBEREIKBAAR:
+            continue
+        row = (1 + here) * width
+        step = min(table[row + n * 4 + h] for h in range(4))
+        if step != ONBEREIKBAAR and cost + step < best:
+            best, last = cost + step, here
+    if last < 0:
+        return ONBEREIKBAAR, None
+
+    order = bytearray(n)
+    mask = full
+    for position in range(n - 1, -1, -1):
+        order[position] = last
+        before = previous[mask * n * 4 + last]
+        mask &= ~(1 << (last >> 2))
+        last = before - 1
+    return best, order
+
+class Writer:
+    """
+        Schrijft de instructies in het compacte formaat van instructions.txt naar 'stream' (een instructie per
+        regel, opeenvolgende "F"'s als "F<aantal>"), zoals PicoEmitter(file, compact=True) in kortsteRoute.py.
+    """
+
+    __slots__ = ("stream", "forward", "count", "size")
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.forward = 0
+        self.count = 0
+        self.size = 0
+
+    def write_help(self, action):
+        text = action if self.size == 0 else "\n" + action
+        self.stream.write(text)
+        self.size += len(text)
+
+    def flush_help(self):
+        if self.forward:
+            self.write_help("F" if self.forward == 1 else "F" + str(self.forward))
+            self.forward = 0
+
+    def emit(self, action):
+        self.count += 1
+        if action == "F":
+            self.forward += 1
+            return
+        self.flush_help()
+        self.write_help(action)
+
+    def close(self):
+        self.flush_help()
+
+def emitSegment_help(plan, source, heading, target, target_heading, direction, collected, writer):
+    """
+        zoekt de deelroute van (source, heading) naar (target, target_heading) opnieuw en schrijft ze als
+        instructies, met 'direction' de rijrichting van het wagentje bij het vertrek. Een groen schijfje wordt
+        opgepikt de eerste keer dat de route op zijn vak rijdt ('collected' is een bytearray per vak).
+        De functie geeft de rijrichting op het einde terug.
+    """
+
+    state = search_help(plan, source, heading, target, target_heading)
+    if state < 0:
+        raise ValueError("!!! Error !!!: Geen route")
+
+    # de zetten (toestanden na een stap vooruit) achterstevoren verzamelen, hoogstens een per vak van het bord
+    moves = array.array("H")
+    parent = plan.parent
+    while parent[state]:
+        before = parent[state] - 1
+        if before >> 2 != state >> 2:
+            moves.append(state)
+        state = before
+
+    for i in range(len(moves) - 1, -1, -1):
+        curr = moves[i] >> 2
+        target_direction = moves[i] & 3
+        turn = (target_direction - direction) & 3
+        if turn == 1:
+            writer.emit("R")
+        elif turn == 2:
+            writer.emit("T180")
+        elif turn == 3:
+            writer.emit("L")
+        writer.emit("F")
+        if plan.grid[curr] == 2 and not collected[curr]:
+            collected[curr] = 1
+            writer.emit("P")
+        direction = target_direction
+    return direction
+
+def now_help():
+    return time.monotonic_ns() // 1000
+
+def memory_help():
+    mem_alloc = getattr(gc, "mem_alloc", None) # enkel in CircuitPython/MicroPython
+    return mem_alloc() if mem_alloc is not None else 0
+
+def planBoard(data, stream, start_direction=1, cap=DEFAULT_CAP):
+    """
+        De functie plant het bord 'data' (een JSON-object zoals bij 'boardFromJson' in kortsteRoute.py) en schrijft
+        de instructies in het compacte formaat naar 'stream' (een object met een methode write). 'start_direction'
+        is de rijrichting van het wagentje op de start (None = vrij).
+
+        Als het geschatte geheugengebruik groter is dan 'cap' bytes wordt er niets gepland en wordt een ValueError
+        opgegooid, net zoals wanneer er geen route bestaat.
+
+        De functie geeft een dictionary terug met de rijtijd ("time", in seconden, inclusief het oppakken), het
+        aantal instructies, het geschatte en (enkel in CircuitPython) het gemeten geheugengebruik in bytes
+        ("estimate", "peak") en de duur van elke fase in milliseconden ("parse_ms", "segments_ms", "order_ms",
+        "route_ms", "total_ms").
+    """
+
+    gc.collect()
+    memory = memory_help()
+    peak = 0
+    started = now_help()
+
+    rows, cols, start, finish, greens, reds = parse_help(data)
+    if len(greens) > MAX_GREENS:
+        raise ValueError(f"!!! Error !!!: Te veel groene schijfjes ({len(greens)}, maximaal {MAX_GREENS})")
+    estimate = estimateMemory(rows, cols, len(greens))
+    if estimate > cap:
+        raise ValueError(f"!!! Error !!!: Te weinig geheugen, {estimate} bytes nodig, maximaal {cap}")
+
+    plan = Plan(rows, cols)
+    for x, y in reds:
+        plan.grid[x * cols + y] = 1
+    for x, y in greens:
+        if plan.grid[x * cols + y] == 0:
+            plan.grid[x * cols + y] = 2
+            plan.greens.append(x * cols + y)
+    plan.greens.sort()
+    for x, y in (start, finish):
+        if not (0 <= x < rows and 0 <= y < cols) or plan.grid[x * cols + y] == 1:
+            raise ValueError(f"!!! Error !!!: Ongeldige positie {(x, y)}")
+    start = start[0] * cols + start[1]
+    finish = finish[0] * cols + finish[1]
+    parsed = now_help()
+
+    # segmenttabel: rij 0 = vertrek op de start, rij 1 + j * 4 + h = vertrek op groen schijfje j met rijrichting h;
+    # kolom k * 4 + h = aankomst op groen schijfje k (k = n: de finish) met rijrichting h
+    n = len(plan.greens)
+    targets = plan.greens + [finish]
+    width = (n + 1) * 4
+    table = array.array("H", bytes(2 * (4 * n + 1) * width))
+    for row in range(4 * n + 1):
+        if row == 0:
+            search_help(plan, start, -1 if start_direction is None else start_direction)
+        else:
+            search_help(plan, plan.greens[(row - 1) >> 2], (row - 1) & 3)
+        for column in range(width):
+            table[row * width + column] = plan.dist[targets[column >> 2] * 4 + (column & 3)]
+    peak = max(peak, memory_help() - memory)
+    searched = now_help()
+
+    cost, order = order_help(table, n)
+    if order is None:
+        raise ValueError("!!! Error !!!: Geen route")
+    peak = max(peak, memory_help() - memory)
+    ordered = now_help()
+
+    writer = Writer(stream)
+    collected = bytearray(rows * cols)
+    direction = 1 if start_direction is None else start_direction
+    cell, heading = start, -1 if start_direction is None else start_direction
+    for here in order:
+        direction = emitSegment_help(plan, cell, heading, plan.greens[here >> 2], here & 3, direction, collected,
+                                     writer)
+        cell, heading = plan.greens[here >> 2], here & 3
+    direction = emitSegment_help(plan, cell, heading, finish, -1, direction, collected, writer)
+    if writer.count:
+        writer.emit("S")
+    writer.close()
+    peak = max(peak, memory_help() - memory)
+    finished = now_help()
+
+    return {
+        "time": (cost * STAP + n * TIMEPICKUP) / 10,
+        "instructions": writer.count,
+        "estimate": estimate,
+        "peak": peak,
+        "parse_ms": (parsed - started) / 1000,
+        "segments_ms": (searched - parsed) / 1000,
+        "order_ms": (ordered - searched) / 1000,
+        "route_ms": (finished - ordered) / 1000,
+        "total_ms": (finished - started) / 1000,
+    }
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# de modules staan naast deze map; achteraan toevoegen, zodat code.py (voor de pico) de standaardmodule niet verbergt
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import kortsteRoute
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """
+        elke test begint met lege caches en zonder schijfcache (ook als KORTSTEROUTE_CACHE gezet is).
+    """
+
+    kortsteRoute.closeDiskCache()
+    for cache in (kortsteRoute.SEGMENT_CACHE, kortsteRoute.SEGMENT_REUSE, kortsteRoute.PATH_CACHE,
+                  kortsteRoute.ROUTE_CACHE):
+        cache.clear()
+    yield
@@ -0,0 +1,43 @@
+import io
+import json
+
+import pytest
+
+import kortsteRoute
+
+
+LINES = [
+    '{"id": "goed", "rows": 3, "cols": 4, "greens": [[1, 2]], "start": [0, 0]}',
+    '[1, 2]',
+    '42',
+    '"tekst"',
+    'geen json',
+    '{"id": "buiten", "rows": 3, "cols": 3, "start": [5, 5]}',
+    '',
+    '{"id": "rood", "board": ["  G", " R ", "   "], "start": [1, 1]}',
+    '{"board": [" G ", "   "], "start": [0, 0], "finish": [1, 2]}',
+]
+
+
+@pytest.mark.parametrize("workers, ordered", [(1, True), (2, True), (2, False)])
+def test_planBatch_bad_lines(workers, ordered):
+    output = io.StringIO()
+    summary = kortsteRoute.planBatch(LINES, output, workers=workers, ordered=ordered)
+
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert summary["boards"] == len(results) == 8
+    by_index = {result["index"]: result for result in results}
+    assert sorted(by_index) == [0, 1, 2, 3, 4, 5, 7, 8]
+    if ordered:
+        assert [result["index"] for result in results] == sorted(by_index)
+
+    for index in (0, 8):
+        assert "error" not in by_index[index]
+        assert by_index[index]["time"] > 0
+    assert by_index[0]["id"] == "goed"
+    assert by_index[8]["id"] == 8
+    for index in (1, 2, 3, 4, 5, 7):
+        assert by_index[index]["error"]
+    assert "JSON-object" in by_index[1]["error"]
+    assert "buiten het bord" in by_index[5]["error"]
+    assert "rood schijfje" in by_index[7]["error"]
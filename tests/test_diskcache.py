@@ -0,0 +1,41 @@
+import sqlite3
+
+import pytest
+
+import kortsteRoute
+
+
+@pytest.fixture
+def disk():
+    yield kortsteRoute.openDiskCache
+    kortsteRoute.closeDiskCache()
+
+
+def test_openDiskCache_bad_file(tmp_path, disk):
+    path = tmp_path / "kapot.sqlite"
+    path.write_bytes(b"dit is geen databank" * 100)
+    with pytest.raises(ValueError, match="kan niet geopend worden"):
+        disk(str(path))
+    assert kortsteRoute.DISK_CACHE is None
+    with pytest.raises(ValueError):
+        disk(str(tmp_path / "bestaat" / "niet.sqlite"))
+
+
+def test_flush_rollback_keeps_count(tmp_path, disk, monkeypatch):
+    cache = disk(str(tmp_path / "cache.sqlite"), max_entries=2)
+    for i in range(2):
+        cache.put("route", i, (1.0, None))
+    cache.flush()
+    assert cache.stats()["size"] == 2
+
+    def fail(self, connection):
+        raise sqlite3.OperationalError("schijf vol")
+
+    monkeypatch.setattr(kortsteRoute.DiskCache, "evict_help", fail)
+    cache.put("route", 2, (1.0, None))
+    cache.flush()
+    stats = cache.stats()
+    assert stats["errors"] == 1
+    assert stats["size"] == 2
+    assert stats["writes"] == 2
+    assert cache.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 2
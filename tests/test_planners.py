@@ -0,0 +1,132 @@
+import itertools
+import random
+
+import pytest
+
+import kortsteRoute
+
+
+def randomBoard(seed):
+    """
+        klein willekeurig bord met enkele rode en groene schijfjes; de start is nooit groen of rood.
+    """
+
+    rng = random.Random(seed)
+    rows, cols = rng.randint(3, 5), rng.randint(3, 6)
+    cells = [(x, y) for x in range(rows) for y in range(cols)]
+    rng.shuffle(cells)
+    start = cells[0]
+    finish = rng.choice([start, cells[1]])
+    rest = [cell for cell in cells if cell not in (start, finish)]
+    reds = rng.randint(0, len(rest) // 5)
+    board = kortsteRoute.initiate_board(rows, cols)
+    for x, y in rest[:reds]:
+        kortsteRoute.putRed(board, x, y)
+    for x, y in rest[reds:reds + rng.randint(0, 5)]:
+        kortsteRoute.putGreen(board, x, y)
+    return board, start, finish
+
+
+def bruteForce(board, start, finish):
+    """
+        referentie: probeert elke volgorde van de groene schijfjes, plakt de deelroutes aan elkaar en rekent de
+        tijd met 'calculateTime'.
+    """
+
+    greens = sorted(kortsteRoute.getGreens(board))
+    table = kortsteRoute.segmentTable(board, start, finish, greens)
+    best = float('inf')
+    for order in itertools.permutations(greens):
+        route = [start]
+        for a, b in zip([start, *order], [*order, finish]):
+            if a == b:
+                continue
+            if (a, b) not in table:
+                break
+            route += table[(a, b)][1][1:]
+        else:
+            time = kortsteRoute.calculateTime(route) if len(route) > 1 else 0
+            best = min(best, time + len(greens) * kortsteRoute.TIMEPICKUP)
+    return best
+
+
+def checkRoute(board, start, finish, cost, route):
+    assert route[0] == start and route[-1] == finish
+    for (x, y), (nx, ny) in zip(route, route[1:]):
+        assert abs(x - nx) + abs(y - ny) == 1
+        assert board[nx][ny] != "R"
+    greens = kortsteRoute.getGreens(board)
+    assert greens <= set(route)
+    time = kortsteRoute.calculateTime(route) if len(route) > 1 else 0
+    assert cost == pytest.approx(time + len(greens) * kortsteRoute.TIMEPICKUP)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_tour_solvers_match_brute_force(seed):
+    board, start, finish = randomBoard(seed)
+    reference = bruteForce(board, start, finish)
+
+    for method in sorted(kortsteRoute.TOUR_SOLVERS):
+        options = {"workers": 2} if method == "parallel" else {}
+        if method == "heuristic":
+            options["time_budget"] = 0.05
+        cost, route = kortsteRoute.planRoute(board, start, finish, method, cache=False, **options)
+        if reference == float('inf'):
+            assert route is None, method
+            continue
+        checkRoute(board, start, finish, cost, route)
+        if method == "heuristic":
+            assert cost >= reference - 1e-9
+        else:
+            assert cost == pytest.approx(reference), method
+
+    cost, route = kortsteRoute.planRoute(board, start, finish, "exact")
+    if reference == float('inf'):
+        assert route is None
+    else:
+        # "exact" kiest ook de deelroutes zelf, en is dus nooit trager
+        assert cost <= reference + 1e-9
+
+
+def warmCaches(board, start, finish):
+    """
+        vult alle caches met ander werk op (bijna) hetzelfde bord: snelste routes tussen alle punten, een gedraaid
+        bord en een bord met een extra rood schijfje.
+    """
+
+    points = [start, finish] + sorted(kortsteRoute.getGreens(board))
+    for a, b in itertools.permutations(points, 2):
+        kortsteRoute.fastestRoute(board, a, b)
+    rows, cols = len(board), len(board[0])
+    turned = kortsteRoute.initiate_board(cols, rows)
+    for x in range(rows):
+        for y in range(cols):
+            turned[y][x] = board[x][y]
+    kortsteRoute.planRoute(turned, start[::-1], finish[::-1], "heldkarp")
+    free = [(x, y) for x in range(rows) for y in range(cols) if board[x][y] == " " and (x, y) not in (start, finish)]
+    if free:
+        blocked = [list(row) for row in board]
+        blocked[free[0][0]][free[0][1]] = "R"
+        for method in ("heldkarp", "branchbound"):
+            kortsteRoute.planRoute(blocked, start, finish, method, cache=False)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_results_do_not_depend_on_cache_state(seed):
+    board, start, finish = randomBoard(seed)
+    methods = ["permutations", "heldkarp", "branchbound", "exact"]
+
+    cold = {}
+    for method in methods:
+        cold[method, False] = kortsteRoute.planRoute(board, start, finish, method, cache=False)
+        for cache in (kortsteRoute.SEGMENT_CACHE, kortsteRoute.SEGMENT_REUSE, kortsteRoute.PATH_CACHE,
+                      kortsteRoute.ROUTE_CACHE):
+            cache.clear()
+        cold[method, True] = kortsteRoute.planRoute(board, start, finish, method)
+
+    warmCaches(board, start, finish)
+    for method, cache in cold:
+        assert kortsteRoute.planRoute(board, start, finish, method, cache=cache) == cold[method, cache], method
+    # ook een tweede keer, nu uit de caches van dit bord zelf
+    for method, cache in cold:
+        assert kortsteRoute.planRoute(board, start, finish, method, cache=cache) == cold[method, cache], method